@@ -3,12 +3,12 @@ AI Analysis & Summaries Router
 Handles: AI analysis (background), AI summary CRUD
 All LLM/ASR/Prompt configuration routes are in settings.py
 """
-import re
 import time
 import sqlite3
 from typing import Optional
 
 from fastapi import APIRouter, Body, HTTPException, BackgroundTasks
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from app.db import (
@@ -19,6 +19,7 @@ from app.core.config import settings
 from app.services.llm import analyze_text
 from app.core.logger import logger, trace_id_ctx
 from app.utils.source_utils import normalize_source_id
+from app.utils.preprocessing import strip_subtitle_metadata, SPECIAL_TOKEN_RE
 from app.core.task_manager import task_manager, TaskCancelledException
 import asyncio
 
@@ -67,11 +68,15 @@ async def process_ai_analysis(
         start_time = time.time()
         
         llm_task = asyncio.create_task(analyze_text(text_to_analyze, prompt, llm_model_id))
-        while not llm_task.done():
-            if task_manager.is_cancelled(task_id):
-                llm_task.cancel()
-                raise TaskCancelledException(f"Task {task_id} cancelled by user")
-            await asyncio.sleep(0.5)
+        # Woken once by cancel_task() instead of polling every 0.5s
+        cancel_wait = asyncio.ensure_future(task_manager.wait_for_cancel(task_id))
+        try:
+            await asyncio.wait({llm_task, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancel_wait.cancel()
+        if not llm_task.done():
+            llm_task.cancel()
+            raise TaskCancelledException(f"Task {task_id} cancelled by user")
             
         summary, model_name = llm_task.result()
         duration = round(time.time() - start_time, 2)
@@ -137,10 +142,9 @@ async def analyze_endpoint(
     if not text_to_analyze:
         raw_text = record['raw_text']
         if request.strip_subtitle:
-            from app.utils.preprocessing import strip_subtitle_metadata
-            text_to_analyze = strip_subtitle_metadata(raw_text)
+            text_to_analyze = await run_in_threadpool(strip_subtitle_metadata, raw_text)
         else:
-            text_to_analyze = re.sub(r'<\|.*?\|>', '', raw_text)
+            text_to_analyze = SPECIAL_TOKEN_RE.sub('', raw_text)
     
     item_id = record['id']
     
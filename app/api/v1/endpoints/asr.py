@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from app.asr.client import asr_client
+from app.services.transcription.dispatcher import invalidate_asr_info_cache
 
 router = APIRouter(tags=["ASR Config"])
 
@@ -32,4 +33,5 @@ async def update_asr_config(config: ASRConfigUpdate):
         active_engine=config.active_engine,
         disabled_engines=config.disabled_engines
     )
+    invalidate_asr_info_cache()
     return {"status": "updated", "config": asr_client.config}
@@ -6,7 +6,6 @@ import requests
 
 from app.db import save_transcription, upsert_video_meta, get_transcription_by_source
 from app.utils.source_utils import normalize_source_id, infer_source_type
-from app.services.cache_task import process_cache_task
 from app.core.logger import logger
 
 router = APIRouter(tags=["Cache Management"])
@@ -78,7 +77,8 @@ async def batch_cache_videos(payload: BatchCacheRequest, background_tasks: Backg
                  status="pending"
             )
         
-        # Queue Task
+        # Queue Task (cache_task pulls in yt-dlp: import on first use)
+        from app.services.cache_task import process_cache_task
         background_tasks.add_task(
              process_cache_task,
              tid, # transcription_id
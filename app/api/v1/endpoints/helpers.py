@@ -1,5 +1,8 @@
+import functools
 import urllib.parse
 
+# Pure string mapping, called for every row of the video list
+@functools.lru_cache(maxsize=4096)
 def _format_cover_url(cover: str) -> str:
     """Format cover URL for frontend consumption"""
     if not cover:
@@ -2,8 +2,6 @@
 Segments Router
 Handles: Segment CRUD, pin/unpin
 """
-import re
-
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -16,6 +14,7 @@ from app.db import (
 from app.core.logger import logger
 from app.schemas import SegmentUpdate
 from app.utils.source_utils import normalize_source_id
+from app.utils.preprocessing import SPECIAL_TOKEN_RE
 
 router = APIRouter(tags=["Segments"])
 
@@ -52,7 +51,7 @@ async def get_video_segments(source_id: str):
             # Prefer original source for display if available
             "source": row['original_source'] or row['source'],
             "raw_text": row['raw_text'],
-            "text": re.sub(r'<\|.*?\|>', '', row['raw_text']),
+            "text": SPECIAL_TOKEN_RE.sub('', row['raw_text']),
             "timestamp": row['timestamp'],
             "segment_start": row['segment_start'],
             "segment_end": row['segment_end'],
@@ -88,7 +87,7 @@ async def get_segment(segment_id: int):
         "id": row['id'],
         "source": row['source'],
         "raw_text": row['raw_text'],
-        "text": re.sub(r'<\|.*?\|>', '', row['raw_text']),
+        "text": SPECIAL_TOKEN_RE.sub('', row['raw_text']),
         "timestamp": row['timestamp'],
         "segment_start": row['segment_start'],
         "segment_end": row['segment_end'],
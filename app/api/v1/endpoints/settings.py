@@ -17,6 +17,7 @@ from app.db import (
     get_all_categories, add_category, update_category, delete_category
 )
 from app.core.logger import logger
+from app.services.transcription.dispatcher import invalidate_asr_info_cache
 from app.schemas import (
     LLMProviderCreate,
     LLMModelCreate,
@@ -121,6 +122,7 @@ async def create_asr_model(model: ASRModelCreate):
         raise HTTPException(status_code=400, detail=f"Invalid JSON config: {e}")
     
     new_id = add_asr_model(model.name, model.engine, model.config)
+    invalidate_asr_info_cache()
     return {"id": new_id, "status": "success"}
 
 
@@ -133,6 +135,7 @@ async def update_asr_model_endpoint(model_id: int, model: ASRModelCreate):
         raise HTTPException(status_code=400, detail=f"Invalid JSON config: {e}")
     
     update_asr_model(model_id, model.name, model.engine, model.config)
+    invalidate_asr_info_cache()
     return {"status": "success"}
 
 
@@ -140,6 +143,7 @@ async def update_asr_model_endpoint(model_id: int, model: ASRModelCreate):
 async def delete_asr_model_endpoint(model_id: int):
     """Delete an ASR model configuration"""
     delete_asr_model(model_id)
+    invalidate_asr_info_cache()
     return {"status": "success"}
 
 
@@ -147,6 +151,7 @@ async def delete_asr_model_endpoint(model_id: int):
 async def activate_asr_model(model_id: int):
     """Set an ASR model as active"""
     set_active_asr_model(model_id)
+    invalidate_asr_info_cache()
     return {"status": "success"}
 
 
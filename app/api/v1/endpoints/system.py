@@ -9,6 +9,7 @@ from fastapi import APIRouter, Body, HTTPException
 from pydantic import BaseModel
 
 from app.db import get_system_config, set_system_config
+from app.services.media_cache import MediaCacheService
 router = APIRouter(prefix="/system", tags=["System"])
 
 from app.api.v1.endpoints.system_cache import router as cache_router
@@ -38,6 +39,8 @@ async def save_system_settings(item: dict = Body(...)):
         raise HTTPException(status_code=400, detail="Missing key")
     
     set_system_config(key, value)
+    if key in ("media_retention_policy", "media_cache_capacity_gb"):
+        MediaCacheService.invalidate_policy_cache()
     return {"status": "success", "key": key, "value": value}
 
 
@@ -11,6 +11,7 @@ from starlette.concurrency import run_in_threadpool
 
 from app.services.media_cache import MediaCacheService
 from app.db import get_system_config, set_system_config, upsert_video_meta
+from app.db.connection import CWD_PREFIX
 from app.core.logger import logger
 from app.core.config import settings
 from app.api.v1.endpoints.covers import download_and_cache_cover
@@ -274,6 +275,7 @@ async def update_media_retention_policy(data: dict = Body(...)):
         except (ValueError, TypeError):
             pass
 
+    MediaCacheService.invalidate_policy_cache()
     return {"status": "success"}
 
 @router.get("/media_stats")
@@ -387,7 +389,7 @@ async def delete_cache_entry_endpoint(source_id: str, quality: str):
     
     # Delete file
     rel_path = entry['media_path']
-    full_path = os.path.join(os.getcwd(), rel_path)
+    full_path = CWD_PREFIX + rel_path
     freed = 0
     if os.path.exists(full_path):
         freed = os.path.getsize(full_path)
@@ -396,6 +398,7 @@ async def delete_cache_entry_endpoint(source_id: str, quality: str):
     # Delete DB record
     from app.db.media_cache_entries import delete_cache_entry
     delete_cache_entry(source_id, quality)
+    MediaCacheService.invalidate_find_cache(source_id)
     
     return {"status": "success", "freed_bytes": freed}
 
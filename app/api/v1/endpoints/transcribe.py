@@ -48,8 +48,8 @@ async def transcribe_file(
         params = await prepare_file_transcription(
             file, source, task_type, use_uvr, language, prompt, auto_analyze_prompt, auto_analyze_prompt_id, auto_analyze_strip_subtitle, output_format
         )
-        file_path = params.get('file_path')
-        return await create_and_dispatch(background_tasks, **params)
+        file_path = params.file_path
+        return await create_and_dispatch(background_tasks, **params.as_kwargs())
     except Exception as e:
         logger.error(f"❌ Transcription request failed: {e}")
         if file_path:
@@ -65,10 +65,10 @@ async def transcribe_bilibili(
 ):
     """Transcribe a Bilibili video."""
     try:
-        params = prepare_bilibili_transcription(request)
+        params = await prepare_bilibili_transcription(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return await create_and_dispatch(background_tasks, **params)
+    return await create_and_dispatch(background_tasks, **params.as_kwargs())
 
 
 @router.post("/transcribe/youtube")
@@ -78,10 +78,10 @@ async def transcribe_youtube(
 ):
     """Transcribe a YouTube video."""
     try:
-        params = prepare_youtube_transcription(request)
+        params = await prepare_youtube_transcription(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return await create_and_dispatch(background_tasks, **params)
+    return await create_and_dispatch(background_tasks, **params.as_kwargs())
 
 
 @router.post("/transcribe/douyin")
@@ -94,7 +94,7 @@ async def transcribe_douyin(
         params = await prepare_douyin_transcription(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return await create_and_dispatch(background_tasks, **params)
+    return await create_and_dispatch(background_tasks, **params.as_kwargs())
 
 
 @router.post("/transcribe/network")
@@ -107,7 +107,7 @@ async def transcribe_network(
         params = await prepare_network_transcription(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return await create_and_dispatch(background_tasks, **params)
+    return await create_and_dispatch(background_tasks, **params.as_kwargs())
 
 
 @router.post("/transcribe/retranscribe")
@@ -120,4 +120,4 @@ async def retranscribe(
         params = await prepare_retranscription(request)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return await create_and_dispatch(background_tasks, **params)
+    return await create_and_dispatch(background_tasks, **params.as_kwargs())
@@ -1,6 +1,6 @@
 import os
 import uuid
-import shutil
+import hashlib
 import mimetypes
 from typing import Dict, Any, List
 from datetime import datetime
@@ -8,14 +8,14 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks, Form, UploadFile,
 
 from app.core.config import settings
 from app.core.logger import logger
-from app.services.storage import storage
+from app.services.storage import storage, COPY_CHUNK_SIZE
 from app.services.transcription.dispatcher import create_and_dispatch
 
 router = APIRouter(prefix="/upload", tags=["Chunked Upload"])
 
 # In-memory store for active upload sessions.
 # In a distributed environment, this should be in Redis.
-# Format: { "upload_id": { "filename": str, "total_chunks": int, "received_chunks": set[int], "temp_path": str, "file_size": int, "metadata": dict, "updated_at": datetime } }
+# Format: { "upload_id": { "filename": str, "total_chunks": int, "received_chunks": set[int], "temp_path": str, "file_size": int, "hasher": blake2b, "metadata": dict, "updated_at": datetime } }
 active_uploads: Dict[str, Dict[str, Any]] = {}
 
 def get_temp_file_path(upload_id: str) -> str:
@@ -51,6 +51,8 @@ async def init_upload(
         "total_chunks": total_chunks,
         "received_chunks": set(),
         "temp_path": temp_path,
+        # Content hash, fed chunk by chunk: same file_<digest> id as /api/transcribe
+        "hasher": hashlib.blake2b(digest_size=16),
         "updated_at": datetime.now(),
         "metadata": {
             "task_type": task_type,
@@ -94,8 +96,14 @@ async def upload_chunk(
         
         # Since our React hook will send chunks strictly sequentially 0, 1, 2...
         # we can just append.
+        hasher = session["hasher"]
         with open(temp_path, "ab") as f:
-            shutil.copyfileobj(file.file, f)
+            while True:
+                block = file.file.read(COPY_CHUNK_SIZE)
+                if not block:
+                    break
+                hasher.update(block)
+                f.write(block)
             
         session["received_chunks"].add(index)
         session["updated_at"] = datetime.now()
@@ -173,17 +181,17 @@ async def finalize_upload(
     # Extract cover if video
     cover = ""
     if source_type == "video":
-        from app.api.v1.endpoints.transcribe import extract_video_frame
+        from app.utils.media_utils import extract_video_frame_async
         cover_name = f"{uuid.uuid4()}.jpg"
         cover_path = os.path.join(settings.COVERS_DIR, cover_name)
-        if extract_video_frame(final_path, cover_path):
+        if await extract_video_frame_async(final_path, cover_path):
             cover = f"/api/covers/{cover_name}"
 
     try:
         # Dispatch task identically to /api/transcribe
         result = await create_and_dispatch(
             background_tasks,
-            source_id=filename,  # Original filename
+            source_id=f"file_{session['hasher'].hexdigest()}",  # Content hash
             original_source=filename,
             source_type=source_type,
             title=filename,
@@ -58,8 +58,7 @@ async def get_videos(
     search: str = None,
 ):
     """Get aggregated video list (paginated), optionally filtered."""
-    return await run_in_threadpool(
-        build_paginated_video_list,
+    return await build_paginated_video_list(
         format_cover=_format_cover_url,
         page=page,
         limit=limit,
@@ -201,7 +200,8 @@ async def get_video_media(source_id: str, quality: str = None):
 @router.get("/videos/{source_id}")
 async def get_video_details(source_id: str):
     """Get full details for a specific video by source_id."""
-    detail = build_video_detail(source_id, _format_cover_url)
+    # DB lookups and the media existence check block; keep them off the loop
+    detail = await run_in_threadpool(build_video_detail, source_id, _format_cover_url)
     if not detail:
         raise HTTPException(status_code=404, detail="Video not found")
     return detail
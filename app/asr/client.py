@@ -236,6 +236,19 @@ class ASRClient:
 
         raise RuntimeError("No available ASR engines (checked priority list and skipped disabled ones).")
 
+    def peek_worker_status(self) -> tuple:
+        """
+        (engine_key, queue_depth) for the worker select_worker() would pick,
+        read from cached availability and the last /health response only.
+        Returns (None, 0) if no engine is available; never raises.
+        """
+        try:
+            engine = self.select_worker()
+        except RuntimeError:
+            return None, 0
+        health = self._last_health.get(engine) or {}
+        return engine, health.get("concurrency", {}).get("queue", 0)
+
     def _check_availability(self, engine: str) -> str:
          """Helper to check if specific engine is available, raise error if not"""
          if self.availability.get(engine, False):
@@ -42,6 +42,12 @@ class Settings(BaseSettings):
     # ASR Configuration
     ASR_ENGINE: str = "sensevoice"
     
+    # Transcription pipelines allowed to run at once (extra jobs queue up)
+    MAX_CONCURRENT_TRANSCRIPTIONS: int = 5
+    
+    # Auto-analysis LLM calls allowed to run at once after transcriptions finish
+    MAX_CONCURRENT_AUTO_ANALYSES: int = 4
+    
     # ASR Workers (Engine Name -> URL)
     ASR_WORKERS: dict = {
         "sensevoice": "http://localhost:8001",
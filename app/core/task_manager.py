@@ -17,16 +17,31 @@ class TaskManager:
                     cls._instance = super(TaskManager, cls).__new__(cls)
                     cls._instance.tasks = {}
                     cls._instance._finished_ids = deque()  # FIFO queue of finished task IDs
+                    cls._instance._cancel_events = {}  # task_id -> (loop, asyncio.Event) for async waiters
         return cls._instance
 
+    def queue_task(self, task_id: int, meta: Dict[str, Any] = None):
+        """Register a task that is waiting for a worker, so it can be listed and cancelled"""
+        with self._lock:
+            self.tasks[task_id] = {
+                "status": "queued",
+                "progress": 0,
+                "message": "Waiting for a free worker...",
+                "cancel_event": threading.Event(),
+                "start_time": time.time(),
+                "meta": meta or {}
+            }
+
     def start_task(self, task_id: int, meta: Dict[str, Any] = None):
-        """Register a new task"""
+        """Register a new task (keeps the cancel signal of a previously queued entry)"""
         with self._lock:
+            previous = self.tasks.get(task_id)
+            cancel_event = previous["cancel_event"] if previous else threading.Event()
             self.tasks[task_id] = {
-                "status": "processing",
+                "status": "cancelling" if cancel_event.is_set() else "processing",
                 "progress": 0,
                 "message": "Starting...",
-                "cancel_event": threading.Event(),
+                "cancel_event": cancel_event,
                 "start_time": time.time(),
                 "meta": meta or {}
             }
@@ -51,6 +66,11 @@ class TaskManager:
                 logger.warning(f"⚠️ RECEIVED CANCEL SIGNAL for Task {task_id}")
                 self.tasks[task_id]["cancel_event"].set()
                 self.tasks[task_id]["status"] = "cancelling"
+                waiter = self._cancel_events.get(task_id)
+                if waiter:
+                    # asyncio.Event is not thread-safe; set it on its own loop
+                    loop, event = waiter
+                    loop.call_soon_threadsafe(event.set)
                 return True
             logger.warning(f"❌ Failed to cancel task {task_id}: Not found")
             return False
@@ -63,23 +83,42 @@ class TaskManager:
                 return True
         return False
 
-    async def wait_for_cancel(self, task_id: int, interval: float = 0.5):
+    def get_cancel_event(self, task_id: int) -> asyncio.Event:
+        """
+        asyncio.Event set when the task is cancelled, bound to the running loop.
+        Lets coroutines await cancellation instead of polling is_cancelled().
+        """
+        with self._lock:
+            waiter = self._cancel_events.get(task_id)
+            if waiter is None:
+                event = asyncio.Event()
+                task = self.tasks.get(task_id)
+                if task and task["cancel_event"].is_set():
+                    event.set()
+                waiter = self._cancel_events[task_id] = (asyncio.get_running_loop(), event)
+            return waiter[1]
+
+    async def wait_for_cancel(self, task_id: int):
         """Async wait until cancelled"""
-        while True:
-            if self.is_cancelled(task_id):
-                return
-            await asyncio.sleep(interval)
+        await self.get_cancel_event(task_id).wait()
 
     def check_cancel(self, task_id: int):
         """Raises Exception if cancelled. Used as a check point."""
         if self.is_cancelled(task_id):
             raise TaskCancelledException(f"Task {task_id} cancelled by user")
 
-    def finish_task(self, task_id: int):
-        """Mark finished and add to history queue, evicting oldest if over limit."""
+    def finish_task(self, task_id: int, status: str = None):
+        """
+        Mark finished and add to history queue, evicting oldest if over limit.
+        status forces the final state (e.g. "cancelled" for a job that never ran).
+        """
         with self._lock:
             if task_id in self.tasks:
-                if self.tasks[task_id]["status"] not in ["cancelled", "failed"]:
+                if status:
+                    self.tasks[task_id]["status"] = status
+                elif self.tasks[task_id]["status"] == "cancelling":
+                    self.tasks[task_id]["status"] = "cancelled"
+                elif self.tasks[task_id]["status"] not in ["cancelled", "failed"]:
                     self.tasks[task_id]["status"] = "completed"
                     self.tasks[task_id]["progress"] = 100
                 self.tasks[task_id]["end_time"] = time.time()
@@ -89,11 +128,13 @@ class TaskManager:
                 while len(self._finished_ids) > self.MAX_HISTORY:
                     old_id = self._finished_ids.popleft()
                     self.tasks.pop(old_id, None)
+            self._cancel_events.pop(task_id, None)
 
     def remove_task(self, task_id: int):
         with self._lock:
             if task_id in self.tasks:
                 del self.tasks[task_id]
+            self._cancel_events.pop(task_id, None)
             # Also remove from finished queue if present
             try:
                 self._finished_ids.remove(task_id)
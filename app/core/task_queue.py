@@ -0,0 +1,107 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.logger import logger
+from app.core.task_manager import task_manager
+
+
+def _close_transcription(task_id: int, status: str, text: str):
+    """Write the final state of a job that never reached the pipeline."""
+    from app.db import update_transcription_fields
+    update_transcription_fields(task_id, text=text, status=status)
+
+
+class TaskQueue:
+    """
+    Bounded pool of worker coroutines fed by an asyncio.Queue.
+    Caps how many transcription pipelines (downloads, yt-dlp, ASR calls)
+    run at once; extra jobs wait in FIFO order instead of all starting.
+    Queued jobs are registered in task_manager so they show up in /tasks
+    and can be cancelled before a worker picks them up.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # worker index -> task_id it is currently running
+        self._running: Dict[int, int] = {}
+
+    def start(self, concurrency: int):
+        """Spawn the workers. Must be called from the running event loop."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(max(1, concurrency))
+        ]
+        logger.info(f"🧵 Task queue started with {len(self._workers)} workers")
+
+    async def stop(self):
+        """Cancel the workers; running and still-queued jobs are marked failed."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # Cancellation bypasses the pipeline's own error handling: close the rows here
+        interrupted, self._running = list(self._running.values()), {}
+        for task_id in interrupted:
+            entry = task_manager.get_task_status(task_id)
+            if entry and "end_time" in entry:
+                continue  # pipeline already finished it (cancelled during cleanup)
+            logger.warning(f"⚠️ Interrupting running task {task_id} on shutdown")
+            await self._fail(task_id, "Error: Server shut down while the task was running")
+        queue, self._queue = self._queue, None
+        while queue is not None and not queue.empty():
+            task_id, fn, _, _ = queue.get_nowait()
+            logger.warning(f"⚠️ Dropping queued task {task_id} on shutdown")
+            await self._fail(task_id, "Error: Server shut down before the task started")
+
+    @staticmethod
+    async def _fail(task_id: int, text: str):
+        """Mark task_id failed both in the DB and in task_manager."""
+        try:
+            await run_in_threadpool(_close_transcription, task_id, "failed", text)
+        except Exception as e:
+            logger.error(f"❌ Failed to mark task {task_id} as failed: {e}")
+        task_manager.finish_task(task_id, status="failed")
+
+    async def put(self, task_id: int, fn: Callable[..., Awaitable[Any]], *args,
+                  meta: Dict[str, Any] = None, **kwargs):
+        """Register task_id as queued and enqueue fn(task_id, *args, **kwargs)."""
+        if self._queue is None:
+            # Not started by the app lifespan (e.g. scripts): start lazily
+            from app.core.config import settings
+            self.start(settings.MAX_CONCURRENT_TRANSCRIPTIONS)
+        task_manager.queue_task(task_id, meta=meta)
+        await self._queue.put((task_id, fn, args, kwargs))
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self, index: int):
+        while True:
+            # Cleared only here, so a cancelled worker leaves its task for stop()
+            self._running.pop(index, None)
+            task_id, fn, args, kwargs = await self._queue.get()
+            self._running[index] = task_id
+            try:
+                if task_manager.is_cancelled(task_id):
+                    logger.warning(f"🛑 Task {task_id} cancelled while queued, skipping")
+                    await run_in_threadpool(_close_transcription, task_id, "cancelled", "Task Cancelled")
+                    task_manager.finish_task(task_id, status="cancelled")
+                    continue
+                await fn(task_id, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"❌ Task queue worker {index} job {getattr(fn, '__name__', fn)} failed: {e}")
+                # Failed before the pipeline took the task over (which closes its
+                # own row): don't leave it queued in task_manager or the DB
+                entry = task_manager.get_task_status(task_id)
+                if entry and entry["status"] == "queued":
+                    await self._fail(task_id, f"Error: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# Global Instance
+task_queue = TaskQueue()
@@ -0,0 +1,32 @@
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+_ALL = object()
+
+
+class TTLCache:
+    """
+    Small memo for read-mostly lookups (settings, engine info).
+    Each key keeps its value for ttl seconds (monotonic clock), then the next
+    get() reloads it. Unlocked: concurrent misses may both load, last one wins.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Cached value for key, calling load() if it is missing or expired."""
+        now = time.monotonic()
+        hit = self._entries.get(key)
+        if hit is None or now - hit[1] >= self.ttl:
+            hit = (load(), now)
+            self._entries[key] = hit
+        return hit[0]
+
+    def invalidate(self, key: Hashable = _ALL):
+        """Drop one key, or every key when called without one."""
+        if key is _ALL:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -11,6 +11,7 @@ from app.db.migrations import init_db
 # Transcriptions
 from app.db.transcriptions import (
     save_transcription,
+    create_transcription_atomic,
     get_history,
     delete_transcription,
     delete_transcriptions_by_source,
@@ -23,6 +24,7 @@ from app.db.transcriptions import (
     get_transcription,
     update_transcription_asr_model,
     update_transcription_is_subtitle,
+    update_transcription_fields,
     get_all_transcriptions_by_source,
     get_best_media_path_by_source,
     update_transcription_is_pinned,
@@ -81,6 +83,8 @@ from app.db.prompts import (
 # System Config
 from app.db.system_config import (
     get_system_config,
+    get_system_config_cached,
+    invalidate_system_config_cache,
     set_system_config,
 )
 
@@ -99,6 +103,7 @@ from app.db.video_meta import (
     delete_video_meta,
     set_archived,
     batch_set_archived,
+    resolve_source_id,
 )
 
 # Media Cache Entries (v9+)
@@ -111,6 +116,7 @@ from app.db.media_cache_entries import (
     delete_cache_entry,
     delete_all_cache_entries,
     get_best_cache_path,
+    get_source_context,
     get_cache_stats,
 )
 
@@ -137,6 +143,7 @@ __all__ = [
     
     # Transcriptions
     "save_transcription",
+    "create_transcription_atomic",
     "get_history",
     "delete_transcription",
     "delete_transcriptions_by_source",
@@ -149,6 +156,7 @@ __all__ = [
     "get_transcription",
     "update_transcription_asr_model",
     "update_transcription_is_subtitle",
+    "update_transcription_fields",
     "get_all_transcriptions_by_source",
     "get_best_media_path_by_source",
     "update_transcription_is_pinned",
@@ -197,6 +205,8 @@ __all__ = [
     
     # System Config
     "get_system_config",
+    "get_system_config_cached",
+    "invalidate_system_config_cache",
     "set_system_config",
     
     # Full-Text Search
@@ -213,6 +223,7 @@ __all__ = [
     "delete_video_meta",
     "set_archived",
     "batch_set_archived",
+    "resolve_source_id",
     
     # Media Cache Entries (v9+)
     "get_cache_entries",
@@ -223,6 +234,7 @@ __all__ = [
     "delete_cache_entry",
     "delete_all_cache_entries",
     "get_best_cache_path",
+    "get_source_context",
     "get_cache_stats",
     
     # Tags (v13+)
@@ -2,7 +2,7 @@
 AI Summaries Database Operations
 CRUD operations for the ai_summaries table.
 """
-from app.db.connection import get_connection, get_connection_with_row
+from app.db.connection import get_connection, get_connection_with_row, chunked
 
 
 def add_ai_summary(transcription_id, prompt, summary, model, response_time=None, parent_id=None, input_text=None):
@@ -67,7 +67,7 @@ def count_ai_summaries(transcription_id):
 
 
 def batch_count_ai_summaries(transcription_ids):
-    """Count AI summaries for multiple transcription IDs in one query.
+    """Count AI summaries for multiple transcription IDs in one query per chunk.
     Returns a dict mapping transcription_id -> count.
     """
     if not transcription_ids:
@@ -75,12 +75,14 @@ def batch_count_ai_summaries(transcription_ids):
     
     conn = get_connection()
     cursor = conn.cursor()
-    placeholders = ','.join('?' * len(transcription_ids))
-    cursor.execute(
-        f'SELECT transcription_id, COUNT(*) as cnt FROM ai_summaries WHERE transcription_id IN ({placeholders}) GROUP BY transcription_id',
-        list(transcription_ids)
-    )
-    result = {row[0]: row[1] for row in cursor.fetchall()}
+    result = {}
+    for chunk in chunked(transcription_ids):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(
+            f'SELECT transcription_id, COUNT(*) as cnt FROM ai_summaries WHERE transcription_id IN ({placeholders}) GROUP BY transcription_id',
+            chunk
+        )
+        result.update(cursor.fetchall())
     conn.close()
     return result
 
@@ -2,13 +2,37 @@
 Database Connection Module
 Provides DB path and connection helpers for all db modules.
 """
+import os
 import sqlite3
+from datetime import datetime
 from app.core.config import settings
 
-def get_connection():
+
+def _convert_datetime(value: bytes):
+    """
+    Parse a stored timestamp into a naive local datetime.
+    Accepts both 'YYYY-MM-DD HH:MM:SS' and frontend ISO strings ('...Z').
+    """
+    text = value.decode()
+    try:
+        if text.endswith("Z"):
+            return datetime.fromisoformat(text[:-1] + "+00:00").astimezone().replace(tzinfo=None)
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+# Opt-in per column: SELECT col AS "col [datetime]" on a PARSE_COLNAMES connection
+sqlite3.register_converter("datetime", _convert_datetime)
+
+
+def get_connection(detect_types: int = 0):
     """Get a new database connection."""
     # Ensure dir exists (already done in config.py but safe to keep)
-    return sqlite3.connect(settings.DB_PATH)
+    return sqlite3.connect(settings.DB_PATH, detect_types=detect_types)
 
 
 def get_connection_with_row():
@@ -16,3 +40,21 @@ def get_connection_with_row():
     conn = get_connection()
     conn.row_factory = sqlite3.Row
     return conn
+
+
+# Stored media paths (media_cache_entries.media_path) are relative to the
+# working directory, which is fixed after startup. Entries are simple relative
+# paths, so CWD_PREFIX + path is equivalent to os.path.join and cheaper.
+CWD = os.getcwd()
+CWD_PREFIX = os.path.join(CWD, "")
+
+
+# Bound parameters per IN (...) list, under SQLite's historical 999-variable limit
+MAX_IN_PARAMS = 900
+
+
+def chunked(items, size: int = MAX_IN_PARAMS):
+    """Yield successive slices of items sized for one IN (...) clause."""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -4,8 +4,9 @@ CRUD operations for the media_cache_entries table.
 Supports multiple cache versions (quality) per source_id.
 """
 import os
+import stat
 from datetime import datetime
-from app.db.connection import get_connection, get_connection_with_row
+from app.db.connection import get_connection, get_connection_with_row, chunked, CWD_PREFIX
 from app.core.logger import logger
 
 
@@ -27,7 +28,7 @@ def get_cache_entries(source_id: str):
 
 def batch_get_cache_counts(source_ids: list):
     """
-    Get cache entry counts for multiple source_ids in one query.
+    Get cache entry counts for multiple source_ids in one query per chunk.
     Returns: dict mapping source_id -> count
     """
     if not source_ids:
@@ -35,12 +36,14 @@ def batch_get_cache_counts(source_ids: list):
     
     conn = get_connection()
     cursor = conn.cursor()
-    placeholders = ','.join('?' * len(source_ids))
-    cursor.execute(
-        f'SELECT source_id, COUNT(*) as cnt FROM media_cache_entries WHERE source_id IN ({placeholders}) GROUP BY source_id',
-        list(source_ids)
-    )
-    result = {row[0]: row[1] for row in cursor.fetchall()}
+    result = {}
+    for chunk in chunked(source_ids):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(
+            f'SELECT source_id, COUNT(*) as cnt FROM media_cache_entries WHERE source_id IN ({placeholders}) GROUP BY source_id',
+            chunk
+        )
+        result.update(cursor.fetchall())
     conn.close()
     return result
 
@@ -131,6 +134,50 @@ def delete_all_cache_entries(source_id: str):
     return count
 
 
+# Quality preference per use:
+# 'playback' prefers video, 'transcription' prefers audio_only for speed
+_QUALITY_PRIORITIES = {
+    'playback': ['best', 'medium', 'video', 'worst', 'audio_only'],
+    'transcription': ['audio_only', 'worst', 'medium', 'best', 'video'],
+}
+
+
+def _usable_file(full_path: str) -> bool:
+    """One stat for both checks: a regular file that is not empty (truncated download)."""
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and st.st_size > 0
+
+
+def _pick_cache_path(entries, priority_mode: str = 'playback'):
+    """
+    Choose the best existing file among a source's cache entries.
+    entries: iterable of (media_path, quality, cached_at)
+    Returns: (media_path, quality) tuple or (None, None)
+    """
+    entries = [e for e in entries if e[0]]
+    by_quality = {quality: media_path for media_path, quality, _ in entries}
+    
+    # Try in priority order
+    for quality in _QUALITY_PRIORITIES.get(priority_mode, _QUALITY_PRIORITIES['playback']):
+        media_path = by_quality.get(quality)
+        if media_path:
+            full_path = CWD_PREFIX + media_path
+            if _usable_file(full_path):
+                return media_path, quality
+            logger.warning(f"⚠️ Cache entry found but file missing or empty: {full_path}")
+    
+    # Fallback: if no priority match, get ANY available cache (latest)
+    # This handles dynamic quality tags like "1080p", "720p" etc.
+    latest = max(entries, key=lambda e: e[2] or "", default=None)
+    if latest and _usable_file(CWD_PREFIX + latest[0]):
+        return latest[0], latest[1]
+    
+    return None, None
+
+
 def get_best_cache_path(source_id: str, priority_mode: str = 'playback'):
     """
     Get the best available cache path for a source_id.
@@ -143,48 +190,53 @@ def get_best_cache_path(source_id: str, priority_mode: str = 'playback'):
                        
     Returns: (media_path, quality) tuple or (None, None)
     """
-    conn = get_connection_with_row()
+    conn = get_connection()
     cursor = conn.cursor()
-    
-    # Determine priority order
-    if priority_mode == 'transcription':
-        # Prefer audio_only for faster processing/less overhead, then fallback to others
-        priorities = ['audio_only', 'worst', 'medium', 'best', 'video']
-    else:
-        # Default/Playback: prefer video
-        priorities = ['best', 'medium', 'video', 'worst', 'audio_only']
-    
-    # Try in priority order
-    for quality in priorities:
-        cursor.execute(
-            'SELECT media_path, quality FROM media_cache_entries WHERE source_id = ? AND quality = ?',
-            (source_id, quality)
-        )
-        row = cursor.fetchone()
-        if row and row['media_path']:
-            full_path = os.path.join(os.getcwd(), row['media_path'])
-            if os.path.exists(full_path):
-                # logger.debug(f"Matches existing file: {full_path}")
-                conn.close()
-                return row['media_path'], quality
-            else:
-                logger.warning(f"⚠️ Cache entry found but file missing: {full_path}")
-    
-    # Fallback: if no priority match, get ANY available cache (latest)
-    # This handles dynamic quality tags like "1080p", "720p" etc.
     cursor.execute(
-        'SELECT media_path, quality FROM media_cache_entries WHERE source_id = ? ORDER BY cached_at DESC LIMIT 1',
+        'SELECT media_path, quality, cached_at FROM media_cache_entries WHERE source_id = ?',
         (source_id,)
     )
-    row = cursor.fetchone()
-    if row and row['media_path']:
-        full_path = os.path.join(os.getcwd(), row['media_path'])
-        if os.path.exists(full_path):
-             conn.close()
-             return row['media_path'], row['quality']
-    
+    entries = cursor.fetchall()
     conn.close()
-    return None, None
+    return _pick_cache_path(entries, priority_mode)
+
+
+def get_source_context(source_id: str, priority_mode: str = 'playback'):
+    """
+    Video metadata, best cached media path and whether any transcription
+    exists for a source, in one query instead of three separate lookups.
+    Returns: dict with keys
+        meta: dict of the video_meta row, or None
+        media_path: relative path of a non-empty file verified on disk, or None
+        has_transcription: bool
+    """
+    conn = get_connection_with_row()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT vm.*,
+               e.media_path AS _media_path, e.quality AS _quality, e.cached_at AS _cached_at,
+               EXISTS(SELECT 1 FROM transcriptions WHERE source = s.sid) AS _has_transcription
+        FROM (SELECT ? AS sid) s
+        LEFT JOIN video_meta vm ON vm.source_id = s.sid
+        LEFT JOIN media_cache_entries e ON e.source_id = s.sid
+    ''', (source_id,))
+    rows = cursor.fetchall()
+    conn.close()
+    
+    # The seed SELECT guarantees at least one row
+    first = rows[0]
+    meta = None
+    if first['source_id'] is not None:
+        meta = {k: first[k] for k in first.keys() if not k.startswith('_')}
+    
+    media_path, _ = _pick_cache_path(
+        ((r['_media_path'], r['_quality'], r['_cached_at']) for r in rows), priority_mode
+    )
+    return {
+        "meta": meta,
+        "media_path": media_path,
+        "has_transcription": bool(first['_has_transcription']),
+    }
 
 
 def get_cache_stats():
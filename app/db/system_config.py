@@ -2,8 +2,13 @@
 System Configuration Database Operations
 Key-value store for system settings.
 """
+from app.core.ttl_cache import TTLCache
 from app.db.connection import get_connection
 
+# Read-mostly settings read on every dispatch; writes go through set_system_config
+_CONFIG_TTL = 60.0
+_config_cache = TTLCache(_CONFIG_TTL)
+
 
 def get_system_config(key, default=None):
     """Get a system configuration value."""
@@ -15,6 +20,20 @@ def get_system_config(key, default=None):
     return row[0] if row else default
 
 
+def get_system_config_cached(key, default=None):
+    """get_system_config() memoized for up to _CONFIG_TTL seconds."""
+    value = _config_cache.get(key, lambda: get_system_config(key))
+    return value if value is not None else default
+
+
+def invalidate_system_config_cache(key=None):
+    """Drop one cached key, or all of them."""
+    if key is None:
+        _config_cache.invalidate()
+    else:
+        _config_cache.invalidate(key)
+
+
 def set_system_config(key, value):
     """Set a system configuration value."""
     conn = get_connection()
@@ -22,3 +41,4 @@ def set_system_config(key, value):
     cursor.execute("INSERT OR REPLACE INTO system_configs (key, value) VALUES (?, ?)", (key, value))
     conn.commit()
     conn.close()
+    invalidate_system_config_cache(key)
@@ -3,7 +3,7 @@ CRUD operations for the tags and video_tags tables.
 """
 import sqlite3
 from typing import List, Dict, Optional
-from app.db.connection import get_connection
+from app.db.connection import get_connection, chunked
 from app.core.logger import logger
 
 def get_all_tags() -> List[Dict]:
@@ -142,7 +142,7 @@ def remove_tag_from_video(source_id: str, tag_id: int):
 
 def batch_get_video_tags(source_ids: List[str]) -> Dict[str, List[Dict]]:
     """
-    Get tags for multiple videos in one query.
+    Get tags for multiple videos in one query per chunk.
     Returns: { source_id: [{id, name, color}, ...] }
     """
     if not source_ids:
@@ -151,21 +151,23 @@ def batch_get_video_tags(source_ids: List[str]) -> Dict[str, List[Dict]]:
     conn = get_connection()
     cursor = conn.cursor()
     try:
-        placeholders = ','.join(['?'] * len(source_ids))
-        cursor.execute(f"""
-            SELECT vt.source_id, t.id, t.name, t.color
-            FROM video_tags vt
-            JOIN tags t ON vt.tag_id = t.id
-            WHERE vt.source_id IN ({placeholders})
-            ORDER BY t.sort_order ASC
-        """, source_ids)
-        
         results = {}
-        for row in cursor.fetchall():
-            sid, tid, tname, tcolor = row
-            if sid not in results:
-                results[sid] = []
-            results[sid].append({"id": tid, "name": tname, "color": tcolor})
+        # A source's tags all land in the same chunk, so per-video order holds
+        for chunk in chunked(source_ids):
+            placeholders = ','.join(['?'] * len(chunk))
+            cursor.execute(f"""
+                SELECT vt.source_id, t.id, t.name, t.color
+                FROM video_tags vt
+                JOIN tags t ON vt.tag_id = t.id
+                WHERE vt.source_id IN ({placeholders})
+                ORDER BY t.sort_order ASC
+            """, chunk)
+            
+            for row in cursor.fetchall():
+                sid, tid, tname, tcolor = row
+                if sid not in results:
+                    results[sid] = []
+                results[sid].append({"id": tid, "name": tname, "color": tcolor})
             
         return results
     finally:
@@ -4,12 +4,18 @@ CRUD operations for the transcriptions table.
 """
 from datetime import datetime
 from app.db.connection import get_connection, get_connection_with_row
+from app.db.video_meta import upsert_video_meta
 
 
 def save_transcription(source, raw_text, segment_start=0, segment_end=None, 
-                       asr_model=None, is_subtitle=False, status='completed'):
-    """Save a new transcription record."""
-    conn = get_connection()
+                       asr_model=None, is_subtitle=False, status='completed', conn=None):
+    """
+    Save a new transcription record.
+    If conn is given the caller owns commit/close.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
     cursor = conn.cursor()
     cursor.execute('''
         INSERT INTO transcriptions (source, raw_text, timestamp, segment_start, segment_end, 
@@ -17,12 +23,45 @@ def save_transcription(source, raw_text, segment_start=0, segment_end=None,
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
     ''', (source, raw_text, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), segment_start, segment_end, 
           asr_model, is_subtitle, status))
-    conn.commit()
     new_id = cursor.lastrowid
-    conn.close()
+    if own_conn:
+        conn.commit()
+        conn.close()
     return new_id
 
 
+def create_transcription_atomic(source_id, meta, tx=None, merge=None):
+    """
+    Upsert video_meta and insert the transcription record in one transaction.
+    Args:
+        source_id: Normalized source id
+        meta: upsert_video_meta kwargs (without source_id)
+        tx: save_transcription kwargs (without source), or None to only save meta
+        merge: Optional callable(existing_meta_row_or_None, meta) -> meta,
+               run inside the transaction before the upsert
+    Returns: new transcription id, or None if tx is None
+    """
+    conn = get_connection_with_row()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if merge:
+            existing = conn.execute('SELECT * FROM video_meta WHERE source_id = ?', (source_id,)).fetchone()
+            meta = merge(existing, meta)
+        
+        upsert_video_meta(source_id, conn=conn, **meta)
+        
+        new_id = None
+        if tx is not None:
+            new_id = save_transcription(source_id, conn=conn, **tx)
+        conn.commit()
+        return new_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
 def get_history():
     """Get all transcriptions ordered by timestamp descending."""
     conn = get_connection_with_row()
@@ -175,6 +214,39 @@ def update_transcription_is_subtitle(item_id, is_subtitle=True):
     conn.close()
 
 
+# update_transcription_fields kwarg -> column
+_UPDATABLE_FIELDS = {
+    "text": "raw_text",
+    "asr_model": "asr_model",
+    "is_subtitle": "is_subtitle",
+    "status": "status",
+}
+
+
+def update_transcription_fields(item_id, **fields):
+    """
+    Update several columns of a transcription in one statement.
+    Accepts text, asr_model, is_subtitle and status; None values are skipped.
+    """
+    sets, params = [], []
+    for key, value in fields.items():
+        if value is None:
+            continue
+        if key not in _UPDATABLE_FIELDS:
+            raise ValueError(f"Unknown transcription field: {key}")
+        if key == "is_subtitle":
+            value = 1 if value else 0
+        sets.append(f"{_UPDATABLE_FIELDS[key]} = ?")
+        params.append(value)
+    if not sets:
+        return
+    
+    conn = get_connection()
+    with conn:
+        conn.execute(f"UPDATE transcriptions SET {', '.join(sets)} WHERE id = ?", (*params, item_id))
+    conn.close()
+
+
 def get_all_transcriptions_by_source(source_id):
     """Find all transcriptions matching a source ID."""
     conn = get_connection_with_row()
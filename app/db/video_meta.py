@@ -32,7 +32,7 @@ def get_all_video_meta():
 
 def upsert_video_meta(source_id: str, cache_expires_at=None, cache_policy=None, notes=None,
                       video_title=None, video_cover=None, source_type=None, stream_url=None, stream_expired=None,
-                      reset_policy=False, original_source=None, is_archived=None):
+                      reset_policy=False, original_source=None, is_archived=None, conn=None):
     """
     Insert or update video metadata.
     Args:
@@ -48,9 +48,12 @@ def upsert_video_meta(source_id: str, cache_expires_at=None, cache_policy=None,
         reset_policy: If True, resets cache_policy and cache_expires_at to NULL (Global Default)
         original_source: The original full source string (optional)
         is_archived: Boolean flag (or None to skip update)
+        conn: Optional open connection; the caller then owns commit/close
     """
     
-    conn = get_connection()
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
     cursor = conn.cursor()
     
     # Check if exists
@@ -134,8 +137,9 @@ def upsert_video_meta(source_id: str, cache_expires_at=None, cache_policy=None,
               original_source, is_archived if is_archived is not None else 0,
               now, now))
         
-    conn.commit()
-    conn.close()
+    if own_conn:
+        conn.commit()
+        conn.close()
 
 
 def update_video_metadata(source_id: str, title: str, cover: str):
@@ -205,85 +209,180 @@ def batch_set_archived(source_ids: list[str], archived: bool):
     return updated_count
 
 
-def query_video_list_with_stats(*, source_type: str = None, tag_id: int = None, exclude_tag_id: int = None):
+def resolve_source_id(normalized_id: str, raw_id: str) -> str:
+    """
+    Pick the stored identifier for a video in one query, trying in order:
+    video_meta by normalized id, video_meta by raw id (legacy un-normalized
+    record), then transcriptions by normalized and raw id.
+    Falls back to normalized_id when nothing matches.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT CASE
+            WHEN EXISTS(SELECT 1 FROM video_meta WHERE source_id = :norm) THEN :norm
+            WHEN EXISTS(SELECT 1 FROM video_meta WHERE source_id = :raw) THEN :raw
+            WHEN EXISTS(SELECT 1 FROM transcriptions WHERE source = :norm) THEN :norm
+            WHEN EXISTS(SELECT 1 FROM transcriptions WHERE source = :raw) THEN :raw
+            ELSE :norm
+        END
+    ''', {"norm": normalized_id, "raw": raw_id})
+    resolved = cursor.fetchone()[0]
+    conn.close()
+    return resolved
+
+
+_VIDEO_LIST_QUERY = '''
+    WITH ranked_transcriptions AS (
+        SELECT 
+            source, id, status, asr_model, is_subtitle, ai_status, timestamp,
+            ROW_NUMBER() OVER(PARTITION BY source ORDER BY id DESC) as rn
+        FROM transcriptions
+    ),
+    latest_transcriptions AS (
+        SELECT * FROM ranked_transcriptions WHERE rn = 1
+    ),
+    transcription_stats AS (
+        SELECT 
+            source,
+            COUNT(*) as seg_count,
+            GROUP_CONCAT(id) as row_ids,
+            MAX(CASE WHEN ai_status IN ('queued', 'processing') THEN 1 ELSE 0 END) as has_ai_processing
+        FROM transcriptions
+        GROUP BY source
+    )
+    SELECT 
+        vm.source_id, vm.original_source, vm.source_type,
+        vm.video_title, vm.video_cover, vm.created_at, vm.updated_at, vm.is_archived,
+        COALESCE(ts.seg_count, 0) as count, ts.row_ids,
+        lt.status as latest_status, lt.timestamp as latest_timestamp,
+        lt.asr_model as latest_asr_model,
+        COALESCE(lt.is_subtitle, 0) as is_subtitle,
+        COALESCE(ts.has_ai_processing, 0) as is_analyzing_ai{extra}
+    FROM video_meta vm
+    LEFT JOIN transcription_stats ts ON vm.source_id = ts.source
+    LEFT JOIN latest_transcriptions lt ON vm.source_id = lt.source
+    {where}
+'''
+
+# Sort orders that can run in SQL; rowid keeps pages stable on ties.
+# The title sort needs Unicode case folding and stays in Python.
+VIDEO_LIST_SQL_ORDERS = {
+    'time': "COALESCE(NULLIF(lt.timestamp, ''), NULLIF(vm.updated_at, ''), NULLIF(vm.created_at, ''), '') DESC, vm.rowid",
+    'segments': "count DESC, vm.rowid",
+}
+
+
+def _video_list_where(source_type, tag_id, exclude_tag_id, status, has_segments, is_subtitle, include_archived):
+    """
+    WHERE clause and params for the video list filters that map onto columns.
+    Mirrors the row defaults of build_video_list_row (NULL source_type is
+    'bilibili', NULL latest status is 'completed').
+    """
+    where, params = [], []
+
+    if source_type:
+        if source_type == 'file':
+            where.append("COALESCE(NULLIF(vm.source_type, ''), 'bilibili') IN ('file', 'video', 'audio')")
+        else:
+            where.append("COALESCE(NULLIF(vm.source_type, ''), 'bilibili') = ?")
+            params.append(source_type)
+
+    if tag_id:
+        where.append("vm.source_id IN (SELECT source_id FROM video_tags WHERE tag_id = ?)")
+        params.append(tag_id)
+    if exclude_tag_id:
+        where.append("vm.source_id NOT IN (SELECT source_id FROM video_tags WHERE tag_id = ?)")
+        params.append(exclude_tag_id)
+
+    if status:
+        if status in ('empty', 'no_content', 'cached_only'):
+            # The cache-count half of no_content/cached_only is checked by the caller
+            where.append("COALESCE(ts.seg_count, 0) = 0")
+        else:
+            where.append("COALESCE(NULLIF(lt.status, ''), 'completed') = ?")
+            params.append(status)
+
+    if has_segments is not None:
+        where.append("COALESCE(ts.seg_count, 0) > 0" if has_segments else "COALESCE(ts.seg_count, 0) = 0")
+    if is_subtitle is not None:
+        where.append("COALESCE(lt.is_subtitle, 0) != 0" if is_subtitle else "COALESCE(lt.is_subtitle, 0) = 0")
+
+    if include_archived == '1':
+        where.append("vm.is_archived = 1")
+    elif include_archived != 'all':
+        where.append("COALESCE(vm.is_archived, 0) = 0")
+
+    return ("WHERE " + " AND ".join(where)) if where else "", params
+
+
+def query_video_list_with_stats(
+    *,
+    source_type: str = None,
+    tag_id: int = None,
+    exclude_tag_id: int = None,
+    status: str = None,
+    has_segments: bool = None,
+    is_subtitle: bool = None,
+    include_archived: str = None,
+):
     """
     Query video_meta joined with transcription stats.
     Returns raw rows as tuples for build_video_list_row().
-    Pre-filters by source_type, tag_id, exclude_tag_id at the SQL/Python level.
+    Filters by source_type, tags, status, segments, subtitle flag and archive
+    state in SQL; has_ai/has_cached/search depend on enrichment and are left
+    to the caller.
     
     Each row: (source_id, original_source, source_type, video_title, video_cover,
                created_at, updated_at, is_archived, count, row_ids, latest_status,
                latest_timestamp, latest_asr_model, is_subtitle, is_analyzing_ai)
     """
+    where, params = _video_list_where(
+        source_type, tag_id, exclude_tag_id, status, has_segments, is_subtitle, include_archived
+    )
     conn = get_connection()
     cursor = conn.cursor()
-
-    # Pre-fetch tag-based source_id sets
-    valid_source_ids = None
-    excluded_source_ids = None
-
-    if tag_id:
-        cursor.execute("SELECT source_id FROM video_tags WHERE tag_id = ?", (tag_id,))
-        valid_source_ids = set(row[0] for row in cursor.fetchall())
-    if exclude_tag_id:
-        cursor.execute("SELECT source_id FROM video_tags WHERE tag_id = ?", (exclude_tag_id,))
-        excluded_source_ids = set(row[0] for row in cursor.fetchall())
-
-    query = '''
-        WITH ranked_transcriptions AS (
-            SELECT 
-                source, id, status, asr_model, is_subtitle, ai_status, timestamp,
-                ROW_NUMBER() OVER(PARTITION BY source ORDER BY id DESC) as rn
-            FROM transcriptions
-        ),
-        latest_transcriptions AS (
-            SELECT * FROM ranked_transcriptions WHERE rn = 1
-        ),
-        transcription_stats AS (
-            SELECT 
-                source,
-                COUNT(*) as seg_count,
-                GROUP_CONCAT(id) as row_ids,
-                MAX(CASE WHEN ai_status IN ('queued', 'processing') THEN 1 ELSE 0 END) as has_ai_processing
-            FROM transcriptions
-            GROUP BY source
-        )
-        SELECT 
-            vm.source_id, vm.original_source, vm.source_type,
-            vm.video_title, vm.video_cover, vm.created_at, vm.updated_at, vm.is_archived,
-            COALESCE(ts.seg_count, 0) as count, ts.row_ids,
-            lt.status as latest_status, lt.timestamp as latest_timestamp,
-            lt.asr_model as latest_asr_model,
-            COALESCE(lt.is_subtitle, 0) as is_subtitle,
-            COALESCE(ts.has_ai_processing, 0) as is_analyzing_ai
-        FROM video_meta vm
-        LEFT JOIN transcription_stats ts ON vm.source_id = ts.source
-        LEFT JOIN latest_transcriptions lt ON vm.source_id = lt.source
-    '''
-
-    cursor.execute(query)
+    cursor.execute(_VIDEO_LIST_QUERY.format(extra="", where=where) + "ORDER BY vm.rowid", params)
     rows = cursor.fetchall()
     conn.close()
+    return rows
 
-    # Post-filter by source_type and tags (lightweight Python filtering)
-    result = []
-    for r in rows:
-        cid = r[0]
-        row_type = r[2] or 'bilibili'
-
-        if source_type:
-            if source_type == 'file':
-                if row_type not in ['file', 'video', 'audio']:
-                    continue
-            elif row_type != source_type:
-                continue
-
-        if valid_source_ids is not None and cid not in valid_source_ids:
-            continue
-        if excluded_source_ids is not None and cid in excluded_source_ids:
-            continue
-
-        result.append(r)
 
-    return result
+def query_video_page_with_stats(
+    *,
+    sort_by: str,
+    limit: int,
+    offset: int,
+    source_type: str = None,
+    tag_id: int = None,
+    exclude_tag_id: int = None,
+    status: str = None,
+    has_segments: bool = None,
+    is_subtitle: bool = None,
+    include_archived: str = None,
+):
+    """
+    One sorted page of query_video_list_with_stats() rows, for sort_by in
+    VIDEO_LIST_SQL_ORDERS. The total comes from a window count in the same query.
+    Returns: (rows, total)
+    """
+    where, params = _video_list_where(
+        source_type, tag_id, exclude_tag_id, status, has_segments, is_subtitle, include_archived
+    )
+    query = (
+        _VIDEO_LIST_QUERY.format(extra=",\n        COUNT(*) OVER () as total", where=where)
+        + f"ORDER BY {VIDEO_LIST_SQL_ORDERS[sort_by]} LIMIT ? OFFSET ?"
+    )
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(query, params + [limit, offset])
+    rows = cursor.fetchall()
+    if rows:
+        total = rows[0][-1]
+    else:
+        # Past the last page: no row carries the window count
+        cursor.execute(f"SELECT COUNT(*) FROM ({_VIDEO_LIST_QUERY.format(extra='', where=where)})", params)
+        total = cursor.fetchone()[0]
+    conn.close()
+    return rows, total
 
@@ -39,6 +39,10 @@ async def lifespan(app: FastAPI):
     # Start ASR Client Health Check
     import asyncio
     asyncio.create_task(asr_client.start_health_check())
+    
+    # Start bounded transcription workers
+    from app.core.task_queue import task_queue
+    task_queue.start(settings.MAX_CONCURRENT_TRANSCRIPTIONS)
 
     # Start Background Media GC (Every hour)
     from app.services.media_cache import MediaCacheService
@@ -81,6 +85,9 @@ async def lifespan(app: FastAPI):
         
     yield
     # Shutdown
+    await task_queue.stop()
+    from app.services.transcription.downloaders import close_network_client
+    await close_network_client()
     logger.info("服务关闭")
 
 
@@ -48,8 +48,6 @@ async def process_cache_task(
         # update_task_status(transcription_id, "processing") # Removed for ephemeral ID
         task_manager.update_progress(transcription_id, 0, "Initializing Cache Task...")
         
-        check_cancel_wrapper = lambda tid=None: task_manager.check_cancel(transcription_id)
-        
         # 2. Download based on type and quality
         task_manager.update_progress(transcription_id, 10, f"Downloading ({source_type})...")
         download_progress = ProgressHelper(task_manager, transcription_id, 10, 90) # Map 0-100 download to 10-90 task
@@ -71,7 +69,7 @@ async def process_cache_task(
                     None, # start_time
                     None, # end_time
                     transcription_id, 
-                    check_cancel_wrapper,
+                    task_manager.check_cancel,
                     download_progress.get_callback()
                 )
                 media_quality_tag = 'audio_only'
@@ -82,7 +80,7 @@ async def process_cache_task(
                     url,
                     quality, # Pass user quality (best/medium/worst)
                     transcription_id, 
-                    check_cancel_wrapper,
+                    task_manager.check_cancel,
                     download_progress.get_callback()
                 )
                 media_quality_tag = quality # Preserve tag (best/medium/worst)
@@ -113,7 +111,7 @@ async def process_cache_task(
                     settings.TEMP_UPLOADS_DIR,
                     proxy,
                     transcription_id,
-                    check_cancel_wrapper,
+                    task_manager.check_cancel,
                     download_progress.get_callback()
                 )
                 media_quality_tag = 'audio_only'
@@ -126,7 +124,7 @@ async def process_cache_task(
                     settings.TEMP_UPLOADS_DIR,
                     proxy,
                     transcription_id,
-                    check_cancel_wrapper,
+                    task_manager.check_cancel,
                     download_progress.get_callback()
                 )
                 media_quality_tag = quality # Preserve tag
@@ -141,7 +139,7 @@ async def process_cache_task(
                 url,
                 "https://www.douyin.com/", # Referer
                 transcription_id,
-                check_cancel_wrapper,
+                task_manager.check_cancel,
                 download_progress.get_callback()
             )
             # Douyin is just direct CDN, no quality selection via yt-dlp
@@ -1,16 +1,178 @@
 import os
+import uuid
 import shutil
+import asyncio
+import sqlite3
+import logging
 import time
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 from app.db.system_config import get_system_config
-from app.db.connection import get_connection
+from app.db.connection import get_connection, chunked, CWD_PREFIX
 from app.db.media_cache_entries import (
     get_cache_entries, get_cache_entry, upsert_cache_entry,
-    delete_cache_entry, delete_all_cache_entries, get_best_cache_path,
+    delete_all_cache_entries, get_best_cache_path,
     get_cache_stats, get_all_cache_entries,
 )
 from app.core.logger import logger
+from app.core.task_manager import task_manager, TaskCancelledException
+from app.core.ttl_cache import TTLCache
+
+# Prebuilt prefixes: cache entries are bare filenames / simple relative paths,
+# so plain concatenation is equivalent to os.path.join and much cheaper
+_CACHE_DIR_PREFIX = os.path.join(settings.MEDIA_CACHE_DIR, "")
+_CACHE_REL_PREFIX = "data/media_cache/"
+
+# Retention config changes rarely; a few seconds of staleness is fine
+_POLICY_TTL = 5.0
+_policy_cache = TTLCache(_POLICY_TTL)  # keys: "retention", "capacity"
+
+# find_existing_cache results, keyed by (source, quality, mode). Short TTL
+# absorbs request bursts; writers for a source invalidate it proactively.
+_FIND_TTL = 2.0
+_FIND_MAX = 1024
+_find_cache = OrderedDict()
+_find_lock = threading.Lock()
+
+# Downloads in progress by flight key (see MediaCacheService.download_once).
+# Only touched from the event loop, so no lock.
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Filename hash only needs to be stable and unique, not cryptographic
+_digest = hashlib.blake2b
+
+
+@functools.lru_cache(maxsize=4096)
+def _filename_for(source: str, quality: str, ext: str) -> str:
+    """
+    Stable cache filename for a source.
+    Quality is part of the name for multi-version support:
+    best -> hash.ext, others -> hash_quality.ext
+    """
+    source_hash = _digest(source.encode("utf-8"), digest_size=12).hexdigest()
+    if quality and quality != 'best':
+        return f"{source_hash}_{quality}{ext}"
+    return f"{source_hash}{ext}"
+
+
+def _safe_unlink(path: str, dir_fd: int = None) -> bool:
+    """
+    Remove a file. A missing file is an expected miss, not an error.
+    Returns True only if this call removed the file.
+    """
+    try:
+        os.unlink(path, dir_fd=dir_fd)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.error(f"❌ Failed to delete {path}: {e}")
+        return False
+
+
+def _bulk_unlink(names: list[str]) -> list[bool]:
+    """
+    _safe_unlink over many files in MEDIA_CACHE_DIR, given by name.
+    Where supported (POSIX), names are removed with unlinkat() against one
+    open directory fd, so the cache dir path is resolved once per sweep.
+    unlink releases the GIL, so a small thread pool overlaps the blocking
+    syscalls. Results keep input order.
+    """
+    if not names:
+        return []
+    
+    dir_fd = None
+    if os.unlink in os.supports_dir_fd:
+        try:
+            dir_fd = os.open(settings.MEDIA_CACHE_DIR, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        except OSError:
+            dir_fd = None
+    
+    try:
+        if dir_fd is not None:
+            unlink = functools.partial(_safe_unlink, dir_fd=dir_fd)
+            targets = names
+        else:
+            unlink = _safe_unlink
+            targets = [_CACHE_DIR_PREFIX + name for name in names]
+        
+        if len(targets) < 2:
+            return [unlink(t) for t in targets]
+        with ThreadPoolExecutor(max_workers=min(8, len(targets))) as ex:
+            return list(ex.map(unlink, targets))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
+def _invalidate_find_cache(source: str = None):
+    """Drop cached lookups for one source, or all of them."""
+    with _find_lock:
+        if source is None:
+            _find_cache.clear()
+        else:
+            for key in [k for k in _find_cache if k[0] == source]:
+                del _find_cache[key]
+
+
+def _begin_write(conn):
+    """
+    Open the cache writer's transaction. WAL lets readers (find_existing_cache,
+    stats) proceed during GC; synchronous=NORMAL drops the per-commit fsync.
+    BEGIN IMMEDIATE takes the write lock up front so the sweep commits once.
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("BEGIN IMMEDIATE")
+
+
+def _fmt_gb(b: int) -> str:
+    return f"{b / (1024**3):.2f} GB"
+
+
+def _log_gc_phase(summary: str, names: list[str], freed: int):
+    """One INFO line per GC phase; the per-file list only at DEBUG."""
+    if not names:
+        return
+    logger.info("%s: %d files, freed %s", summary, len(names), _fmt_gb(freed))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: %s", summary, ", ".join(names))
+
+
+def _link_private_copy(path: str):
+    """
+    Hard-link path to a fresh name beside it, so a second pipeline can own
+    (and later cache or delete) its own copy. Returns the new path, or None
+    if the file is gone or the filesystem can't link.
+    """
+    root, ext = os.path.splitext(path)
+    new_path = f"{root}.{uuid.uuid4().hex[:8]}{ext}"
+    try:
+        os.link(path, new_path)
+    except OSError:
+        return None
+    return new_path
+
+
+def _exists(path: str) -> bool:
+    """Existence-only probe; skips building a stat_result."""
+    return os.access(path, os.F_OK)
+
+
+def _stat_or_none(path: str):
+    """Single stat for callers that need both existence and size."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
 
 class MediaCacheService:
     @staticmethod
@@ -21,17 +183,63 @@ class MediaCacheService:
             tuple: (policy_name, days)
             policy_name: 'delete_after_asr' | 'always_keep' | 'keep_days'
             days: int (only for 'keep_days')
+        Cached for _POLICY_TTL seconds; see invalidate_policy_cache().
         """
+        return _policy_cache.get("retention", MediaCacheService._load_retention_policy)
+
+    @staticmethod
+    def _load_retention_policy():
         policy_str = get_system_config("media_retention_policy", "keep_days:3")
         
+        result = (policy_str, 0)
         if policy_str.startswith("keep_days:"):
             try:
                 days = int(policy_str.split(":")[1])
-                return "keep_days", days
+                result = ("keep_days", days)
             except (ValueError, TypeError):
-                return "delete_after_asr", 0
-        
-        return policy_str, 0
+                result = ("delete_after_asr", 0)
+        return result
+
+    @staticmethod
+    def get_capacity_gb():
+        """Get the cache capacity limit in GB (0 = unlimited). Cached like the retention policy."""
+        return _policy_cache.get("capacity", MediaCacheService._load_capacity_gb)
+
+    @staticmethod
+    def _load_capacity_gb():
+        try:
+            return float(get_system_config("media_cache_capacity_gb", "0"))
+        except (ValueError, TypeError):
+            return 0.0
+
+    @staticmethod
+    def invalidate_policy_cache():
+        """Drop cached retention/capacity config. Call after writing either setting."""
+        _policy_cache.invalidate()
+
+    @staticmethod
+    def invalidate_find_cache(source: str = None):
+        """Drop cached find_existing_cache lookups. Call after writing media_cache_entries."""
+        _invalidate_find_cache(source)
+
+    @staticmethod
+    def _snapshot_cache_dir():
+        """
+        Scan the media cache directory once.
+        Returns:
+            dict: {filename: size_bytes} for every regular file in MEDIA_CACHE_DIR
+        """
+        snap = {}
+        try:
+            it = os.scandir(settings.MEDIA_CACHE_DIR)
+        except FileNotFoundError:
+            return snap
+        # DirEntry caches d_type and its stat, so this is ~1 syscall per file
+        with it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    snap[entry.name] = entry.stat(follow_symlinks=False).st_size
+        return snap
 
     @staticmethod
     def should_keep():
@@ -57,19 +265,101 @@ class MediaCacheService:
         if not source:
             return (None, None) if return_quality else None
         
+        key = (source, quality, mode)
+        now = time.monotonic()
+        with _find_lock:
+            hit = _find_cache.get(key)
+            if hit and hit[2] > now:
+                _find_cache.move_to_end(key)
+            else:
+                hit = None
+        # Re-probe a cached path: one access() call catches files removed
+        # behind the cache's back (manual deletes, external cleanup)
+        if hit and (hit[0] is None or _exists(CWD_PREFIX + hit[0])):
+            path, found_quality = hit[0], hit[1]
+            return (path, found_quality) if return_quality else path
+        
+        path, found_quality = None, None
         if quality:
             entry = get_cache_entry(source, quality)
             if entry and entry['media_path']:
-                full_path = os.path.join(os.getcwd(), entry['media_path'])
-                if os.path.exists(full_path):
-                    return (entry['media_path'], quality) if return_quality else entry['media_path']
+                full_path = CWD_PREFIX + entry['media_path']
+                if _exists(full_path):
+                    path, found_quality = entry['media_path'], quality
         else:
             # Find best available using mode priority
             path, found_quality = get_best_cache_path(source, priority_mode=mode)
-            if path:
-                return (path, found_quality) if return_quality else path
+            if not path:
+                path, found_quality = None, None
         
-        return (None, None) if return_quality else None
+        with _find_lock:
+            _find_cache[key] = (path, found_quality, now + _FIND_TTL)
+            _find_cache.move_to_end(key)
+            if len(_find_cache) > _FIND_MAX:
+                _find_cache.popitem(last=False)
+        
+        return (path, found_quality) if return_quality else path
+
+    @staticmethod
+    def find_unchanged_cache(source: str, remote_size: int):
+        """
+        Relative path of the cached media for source if its size on disk
+        equals remote_size (the upstream file looks unchanged), else None.
+        """
+        if not remote_size:
+            return None
+        path = MediaCacheService.find_existing_cache(source, mode='transcription')
+        if not path:
+            return None
+        st = _stat_or_none(CWD_PREFIX + path)
+        return path if st and st.st_size == remote_size else None
+
+    @staticmethod
+    async def download_once(key: str, download: Callable[[], Awaitable[str]],
+                            task_id: Optional[int] = None) -> str:
+        """
+        Single-flight download: concurrent callers with the same key share one
+        download instead of fetching the same media twice.
+        The first caller runs download(); the others wait for it and get their
+        own hard link to the result, so each pipeline still cleans up its file.
+        If the shared download failed or its file is already gone, one of the
+        waiters becomes the new leader and the rest keep waiting on it.
+        A waiter with a task_id stops waiting (TaskCancelledException) as soon
+        as that task is cancelled.
+        """
+        while True:
+            flight = _inflight.get(key)
+            if flight is None:
+                flight = asyncio.get_running_loop().create_future()
+                _inflight[key] = flight
+                path = None
+                try:
+                    path = await download()
+                    return path
+                finally:
+                    del _inflight[key]
+                    flight.set_result(path)
+            
+            logger.info(f"⏳ Waiting for in-flight download of {key}")
+            if task_id is None:
+                shared_path = await asyncio.shield(flight)
+            else:
+                cancelled = asyncio.ensure_future(task_manager.wait_for_cancel(task_id))
+                try:
+                    # asyncio.wait never cancels flight, so the leader is unaffected
+                    await asyncio.wait({flight, cancelled}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    cancelled.cancel()
+                if not flight.done():
+                    raise TaskCancelledException(f"Task {task_id} cancelled while waiting for {key}")
+                shared_path = flight.result()
+            
+            if shared_path:
+                own_path = await run_in_threadpool(_link_private_copy, shared_path)
+                if own_path:
+                    logger.info(f"🔗 Reusing concurrent download for {key}: {own_path}")
+                    return own_path
+            # Leader failed or its file is gone: loop, and the first waiter back takes over
 
     @staticmethod
     def cache_file(temp_path: str, transcription_id: int, source: str = None, quality: str = 'best'):
@@ -85,7 +375,7 @@ class MediaCacheService:
             
         Returns the relative path to the cached file.
         """
-        if not temp_path or not os.path.exists(temp_path):
+        if not temp_path or not _exists(temp_path):
             return None
 
         # Ensure cache directory exists
@@ -94,28 +384,19 @@ class MediaCacheService:
         new_filename = None
         
         if source:
-            import hashlib
-            source_hash = hashlib.md5(source.encode("utf-8")).hexdigest()
-            ext = os.path.splitext(temp_path)[1]
-            # Include quality in filename for multi-version support
-            # best -> hash.ext
-            # others -> hash_quality.ext
-            if quality and quality != 'best':
-                new_filename = f"{source_hash}_{quality}{ext}"
-            else:
-                new_filename = f"{source_hash}{ext}"
+            new_filename = _filename_for(source, quality, os.path.splitext(temp_path)[1])
         else:
             # Fallback to ID-based naming
             original_name = os.path.basename(temp_path)
             new_filename = f"{transcription_id}_{original_name}"
             
-        target_path = os.path.join(settings.MEDIA_CACHE_DIR, new_filename)
+        target_path = _CACHE_DIR_PREFIX + new_filename
         
         try:
-            relative_path = os.path.join("data", "media_cache", new_filename).replace("\\", "/")
+            relative_path = _CACHE_REL_PREFIX + new_filename
             
             # If target already exists and source-hash, assume same file
-            if os.path.exists(target_path) and source:
+            if source and _exists(target_path):
                 logger.info(f"🔄 Reusing existing cache for {source}: {relative_path}")
                 try:
                     os.remove(temp_path)
@@ -126,7 +407,8 @@ class MediaCacheService:
                 shutil.move(temp_path, target_path)
             
             # Calculate file size
-            file_size = os.path.getsize(target_path) if os.path.exists(target_path) else 0
+            st = _stat_or_none(target_path)
+            file_size = st.st_size if st else 0
             
             # v9: Update media_cache_entries table
             source_id = source
@@ -142,6 +424,7 @@ class MediaCacheService:
             
             if source_id:
                 upsert_cache_entry(source_id, quality, relative_path, file_size)
+                _invalidate_find_cache(source_id)
                 # Also reset expired custom policy
                 MediaCacheService._reset_expired_policy(source_id)
             
@@ -154,31 +437,26 @@ class MediaCacheService:
     @staticmethod
     def _reset_expired_policy(source_id: str):
         """Reset expired custom cache policy for a source."""
-        conn = get_connection()
+        conn = get_connection(detect_types=sqlite3.PARSE_COLNAMES)
         try:
             cursor = conn.cursor()
-            now = datetime.now()
-            
-            cursor.execute("SELECT cache_policy, cache_expires_at FROM video_meta WHERE source_id = ?", (source_id,))
-            meta = cursor.fetchone()
-            
-            if meta:
-                policy, expires_at = meta
-                if policy == 'custom' and expires_at:
-                    expires_dt = expires_at
-                    if isinstance(expires_at, str):
-                        try:
-                            expires_dt = datetime.fromisoformat(expires_at)
-                        except ValueError:
-                            pass
-                            
-                    if isinstance(expires_dt, datetime) and expires_dt < now:
-                        logger.info(f"🔄 Resetting expired custom policy for {source_id}")
-                        cursor.execute(
-                            "UPDATE video_meta SET cache_policy = NULL, cache_expires_at = NULL WHERE source_id = ?",
-                            (source_id,)
-                        )
-                        conn.commit()
+            # cache_expires_at holds mixed formats (sqlite local "YYYY-MM-DD HH:MM:SS"
+            # and frontend UTC "...T...Z"), so compare after the [datetime]
+            # converter normalizes it rather than as TEXT in SQL
+            cursor.execute(
+                """SELECT cache_expires_at AS "cache_expires_at [datetime]" FROM video_meta
+                   WHERE source_id = ? AND cache_policy = 'custom'""",
+                (source_id,)
+            )
+            row = cursor.fetchone()
+            if row and row[0] and row[0] < datetime.now():
+                cursor.execute(
+                    """UPDATE video_meta SET cache_policy = NULL, cache_expires_at = NULL
+                       WHERE source_id = ? AND cache_policy = 'custom'""",
+                    (source_id,)
+                )
+                conn.commit()
+                logger.info(f"🔄 Reset expired custom policy for {source_id}")
         except Exception as e:
             logger.error(f"❌ Error resetting policy for {source_id}: {e}")
         finally:
@@ -194,11 +472,10 @@ class MediaCacheService:
         conn.close()
         
         if row:
-            file_size = 0
-            full_path = os.path.join(os.getcwd(), relative_path)
-            if os.path.exists(full_path):
-                file_size = os.path.getsize(full_path)
+            st = _stat_or_none(CWD_PREFIX + relative_path)
+            file_size = st.st_size if st else 0
             upsert_cache_entry(row[0], quality, relative_path, file_size)
+            _invalidate_find_cache(row[0])
 
     @staticmethod
     def cleanup_or_delete(temp_path: str, transcription_id: int, source: str = None, quality: str = 'best'):
@@ -209,33 +486,20 @@ class MediaCacheService:
         if not temp_path:
             return
 
-        if not os.path.exists(temp_path):
-            return
-
         if MediaCacheService.should_keep():
+            # cache_file returns early if temp_path is already gone
             MediaCacheService.cache_file(temp_path, transcription_id, source, quality)
-        else:
-            try:
-                os.remove(temp_path)
-                logger.debug(f"🗑️ Deleted temp file: {temp_path}")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to delete temp file {temp_path}: {e}")
+        elif _safe_unlink(temp_path):
+            logger.debug("🗑️ Deleted temp file: %s", temp_path)
 
     @staticmethod
-    def get_gc_candidates(dry_run: bool = True):
+    def _expiry_clause(policy: str, days: int, now: datetime):
         """
-        Identify files eligible for deletion based on retention policy.
-        v9: Uses media_cache_entries table.
+        Build the SQL condition matching cache entries past their retention.
+        Expects `e` = media_cache_entries and `vm` = video_meta in the query.
         Returns:
-            list: List of dicts {source_id, quality, media_path, policy, reason, size, title}
+            tuple: (sql_fragment, params)
         """
-        policy, days = MediaCacheService.get_retention_policy()
-        candidates = []
-        
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        now = datetime.now()
         where_clauses = []
         params = []
         
@@ -253,12 +517,41 @@ class MediaCacheService:
             cutoff_date = now - timedelta(hours=1)
             where_clauses.append("(vm.cache_policy IS NULL AND e.cached_at < ?)")
             params.append(cutoff_date)
+        
+        return " OR ".join(where_clauses), params
 
-        if where_clauses:
-            full_where = " OR ".join(where_clauses)
+    @staticmethod
+    def get_gc_candidates(dry_run: bool = True, snap: dict = None):
+        """
+        Identify files eligible for deletion based on retention policy.
+        v9: Uses media_cache_entries table.
+        Args:
+            snap: Optional cache dir snapshot from _snapshot_cache_dir()
+        Returns:
+            list: List of dicts {source_id, quality, media_path, policy, reason, size, title}
+        """
+        policy, days = MediaCacheService.get_retention_policy()
+        candidates = []
+        if snap is None:
+            snap = MediaCacheService._snapshot_cache_dir()
+        
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        # Same for every non-custom row, so format it once
+        global_reason = "Global Policy Expiry"
+        if policy == 'delete_after_asr':
+            global_reason = "Global Policy (Delete after ASR)"
+        elif policy == 'keep_days':
+            global_reason = f"Global Policy (> {days} days)"
+        
+        full_where, params = MediaCacheService._expiry_clause(policy, days, datetime.now())
+        if full_where:
+            # keep_forever is excluded here, and each row carries its reason_code
             sql = f"""
-                SELECT e.source_id, e.quality, e.media_path, e.file_size, e.cached_at,
-                       vm.cache_policy, vm.video_title, vm.cache_expires_at
+                SELECT e.source_id, e.quality, e.media_path, e.file_size,
+                       vm.cache_policy, vm.video_title, vm.cache_expires_at,
+                       CASE WHEN vm.cache_policy = 'custom' THEN 'custom' ELSE 'global' END AS reason_code
                 FROM media_cache_entries e
                 LEFT JOIN video_meta vm ON e.source_id = vm.source_id
                 WHERE (vm.cache_policy IS NOT 'keep_forever' OR vm.cache_policy IS NULL)
@@ -269,23 +562,14 @@ class MediaCacheService:
             expired_rows = cursor.fetchall()
             
             for row in expired_rows:
-                source_id, quality, rel_path, file_size, cached_at, vm_policy, title, expires_at = row
+                source_id, quality, rel_path, file_size, vm_policy, title, expires_at, reason_code = row
                 
-                if vm_policy == 'keep_forever': 
-                    continue
-                    
-                full_path = os.path.join(os.getcwd(), rel_path)
-                size = file_size or 0
-                if size == 0 and os.path.exists(full_path):
-                    size = os.path.getsize(full_path)
+                size = file_size or snap.get(os.path.basename(rel_path), 0)
                 
-                reason = "Global Policy Expiry"
-                if vm_policy == 'custom':
+                if reason_code == 'custom':
                     reason = f"Custom Policy Expired ({expires_at})"
-                elif policy == 'delete_after_asr':
-                    reason = "Global Policy (Delete after ASR)"
-                elif policy == 'keep_days':
-                    reason = f"Global Policy (> {days} days)"
+                else:
+                    reason = global_reason
 
                 candidates.append({
                     "source_id": source_id,
@@ -301,15 +585,17 @@ class MediaCacheService:
         return candidates
 
     @staticmethod
-    def get_expiring_soon(days: int = 1):
+    def get_expiring_soon(days: int = 1, snap: dict = None):
         """
         Identify files expiring within the next N days.
         v9: Uses media_cache_entries table.
         """
         policy, keep_days = MediaCacheService.get_retention_policy()
         candidates = []
+        if snap is None:
+            snap = MediaCacheService._snapshot_cache_dir()
         
-        conn = get_connection()
+        conn = get_connection(detect_types=sqlite3.PARSE_COLNAMES)
         cursor = conn.cursor()
         
         now = datetime.now()
@@ -333,8 +619,10 @@ class MediaCacheService:
         if where_clauses:
             full_where = " OR ".join(where_clauses)
             sql = f"""
-                SELECT e.source_id, e.quality, e.media_path, e.file_size, e.cached_at,
-                       vm.cache_policy, vm.video_title, vm.cache_expires_at
+                SELECT e.source_id, e.quality, e.media_path, e.file_size,
+                       e.cached_at AS "cached_at [datetime]",
+                       vm.video_title, vm.cache_expires_at AS "cache_expires_at [datetime]",
+                       CASE WHEN vm.cache_policy = 'custom' THEN 'custom' ELSE 'keep_days' END AS reason_code
                 FROM media_cache_entries e
                 LEFT JOIN video_meta vm ON e.source_id = vm.source_id
                 WHERE ({full_where})
@@ -344,25 +632,20 @@ class MediaCacheService:
             cursor.execute(sql, tuple(params))
             rows = cursor.fetchall()
             
+            global_reason = f"Global Policy ({keep_days} days)"
             for row in rows:
-                source_id, quality, rel_path, file_size, cached_at, vm_policy, title, expires_at = row
-                
-                full_path = os.path.join(os.getcwd(), rel_path)
-                size = file_size or 0
-                if size == 0 and os.path.exists(full_path):
-                    size = os.path.getsize(full_path)
+                source_id, quality, rel_path, file_size, cached_at, title, expires_at, reason_code = row
                 
-                expiry_dt = None
-                reason = ""
+                size = file_size or snap.get(os.path.basename(rel_path), 0)
                 
-                if vm_policy == 'custom':
-                    expiry_dt = expires_at if isinstance(expires_at, datetime) else datetime.fromisoformat(expires_at)
+                if reason_code == 'custom':
+                    expiry_dt = expires_at
                     reason = "Custom Policy"
                 else:
                     expiry_dt = cached_at + timedelta(days=keep_days)
-                    reason = f"Global Policy ({keep_days} days)"
+                    reason = global_reason
                 
-                if expiry_dt > now:
+                if expiry_dt and expiry_dt > now:
                     candidates.append({
                         "source_id": source_id,
                         "quality": quality,
@@ -382,6 +665,8 @@ class MediaCacheService:
         """
         Run Garbage Collection.
         v9: Uses media_cache_entries table.
+        All three passes (expired, orphans, capacity) share one connection,
+        one directory snapshot and one transaction.
         
         Args:
             target_source_ids: Optional list of source_ids to delete.
@@ -391,124 +676,124 @@ class MediaCacheService:
         """
         deleted_count = 0
         freed_bytes = 0
+        full_gc = target_source_ids is None
         
-        # 1. Expired Candidates
-        candidates = MediaCacheService.get_gc_candidates(dry_run=False)
+        policy, days = MediaCacheService.get_retention_policy()
+        expiry_sql, params = MediaCacheService._expiry_clause(policy, days, datetime.now())
+        snap = MediaCacheService._snapshot_cache_dir()
         
-        for item in candidates:
-            source_id = item['source_id']
-            quality = item.get('quality', 'best')
+        conn = get_connection()
+        try:
+            _begin_write(conn)
+            cursor = conn.cursor()
+            # Every entry, tagged with whether it is past retention
+            cursor.execute(f"""
+                SELECT e.id, e.source_id, e.media_path, e.file_size,
+                       CASE WHEN vm.cache_policy IS NOT 'keep_forever' AND ({expiry_sql})
+                            THEN 1 ELSE 0 END AS expired
+                FROM media_cache_entries e
+                LEFT JOIN video_meta vm ON e.source_id = vm.source_id
+            """, tuple(params))
+            rows = cursor.fetchall()
             
-            if target_source_ids is not None:
-                if source_id not in target_source_ids:
+            # 1. Expired Candidates
+            expired_ids = []
+            to_remove = []
+            for entry_id, source_id, rel_path, file_size, expired in rows:
+                if not expired or (not full_gc and source_id not in target_source_ids):
                     continue
-
-            rel_path = item['media_path']
-            full_path = os.path.join(os.getcwd(), rel_path)
+                
+                expired_ids.append((entry_id,))
+                filename = os.path.basename(rel_path)
+                if filename in snap:
+                    to_remove.append((filename, rel_path, file_size or 0))
             
-            # v9: Delete from media_cache_entries
-            delete_cache_entry(source_id, quality)
+            results = _bulk_unlink([filename for filename, _, _ in to_remove])
+            deleted = []
+            phase_freed = 0
+            for (filename, rel_path, size), removed in zip(to_remove, results):
+                if removed:
+                    snap.pop(filename, None)
+                    phase_freed += size
+                    deleted.append(rel_path)
+            _log_gc_phase("🗑️ GC deleted expired media", deleted, phase_freed)
+            freed_bytes += phase_freed
+            deleted_count += len(deleted)
             
-            # Delete file
-            if os.path.exists(full_path):
-                try:
-                    os.remove(full_path)
-                    freed_bytes += item['filesize']
-                    deleted_count += 1
-                    logger.info(f"🗑️ GC deleted expired media: {rel_path} ({item['reason']})")
-                except Exception as e:
-                    logger.error(f"❌ GC failed to delete {full_path}: {e}")
-
-        # 2. Orphaned files (only during full GC)
-        if target_source_ids is None:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT media_path FROM media_cache_entries")
-            valid_paths = {os.path.normpath(row[0]) for row in cursor.fetchall()}
-            conn.close()
-
-            if os.path.exists(settings.MEDIA_CACHE_DIR):
-                for filename in os.listdir(settings.MEDIA_CACHE_DIR):
-                    full_path = os.path.join(settings.MEDIA_CACHE_DIR, filename)
-                    rel_path = os.path.join("data", "media_cache", filename)
-                    
-                    if os.path.normpath(rel_path) not in valid_paths:
-                        try:
-                            if os.path.isfile(full_path):
-                                size = os.path.getsize(full_path)
-                                os.remove(full_path)
-                                freed_bytes += size
-                                deleted_count += 1
-                                logger.info(f"🧹 GC removed orphaned file: {filename}")
-                        except Exception as e:
-                            logger.error(f"❌ GC failed to delete orphan {filename}: {e}")
-
-        # 3. Capacity Limit Enforcement (only during full GC)
-        if target_source_ids is None:
-            # Check for capacity limit
-            try:
-                capacity_msg = get_system_config("media_cache_capacity_gb", "0")
-                capacity_gb = float(capacity_msg)
-            except (ValueError, TypeError):
-                capacity_gb = 0.0
+            # Drop expired rows now so the capacity queries below see what is left
+            cursor.executemany("DELETE FROM media_cache_entries WHERE id = ?", expired_ids)
             
-            if capacity_gb > 0:
-                stats = MediaCacheService.get_stats()
-                current_size = stats.get('total_size_bytes', 0)
-                limit_bytes = int(capacity_gb * 1024 * 1024 * 1024)
+            # 2. Orphaned files (only during full GC)
+            if full_gc:
+                # All cache files live directly in MEDIA_CACHE_DIR, so names suffice
+                valid_names = {os.path.basename(row[2]) for row in rows}
+                orphans = [name for name in snap if name not in valid_names]
                 
-                if current_size > limit_bytes:
-                    bytes_to_free = current_size - limit_bytes
-                    # Simple formatting helper inline
-                    def fmt(b): 
-                        return f"{b / (1024**3):.2f} GB"
-
-                    logger.info(f"💾 Cache over capacity ({fmt(current_size)} > {capacity_gb}GB). Need to free {fmt(bytes_to_free)}.")
-                    
-                    conn = get_connection()
-                    cursor = conn.cursor()
-                    
-                    # Find oldest cache entries (excluding 'keep_forever' policy)
-                    # We prioritize deleting 'delete_after_asr' even if not expired (unlikely if loop 1 works),
-                    # then 'temp' or anything that is simply old.
-                    # We exclude 'keep_forever' items from eviction? Usually capacity limit overrides keep days but respects manual keep forever.
-                    # Let's respect 'keep_forever'.
-                    
-                    sql = """
-                        SELECT e.source_id, e.quality, e.media_path, e.file_size, e.cached_at
-                        FROM media_cache_entries e
-                        LEFT JOIN video_meta vm ON e.source_id = vm.source_id
-                        WHERE (vm.cache_policy IS NOT 'keep_forever' OR vm.cache_policy IS NULL)
-                        ORDER BY e.cached_at ASC
-                    """
-                    cursor.execute(sql)
-                    all_candidates = cursor.fetchall()
-                    conn.close()
-                    
-                    freed_in_capacity_check = 0
+                results = _bulk_unlink(orphans)
+                deleted = []
+                phase_freed = 0
+                for filename, removed in zip(orphans, results):
+                    if removed:
+                        phase_freed += snap.pop(filename)
+                        deleted.append(filename)
+                _log_gc_phase("🧹 GC removed orphaned files", deleted, phase_freed)
+                freed_bytes += phase_freed
+                deleted_count += len(deleted)
+            
+            # 3. Capacity Limit Enforcement (only during full GC)
+            if full_gc:
+                capacity_gb = MediaCacheService.get_capacity_gb()
+                if capacity_gb > 0:
+                    cursor.execute("SELECT COALESCE(SUM(file_size), 0) FROM media_cache_entries")
+                    current_size = cursor.fetchone()[0]
+                    limit_bytes = int(capacity_gb * 1024 * 1024 * 1024)
                     
-                    for row in all_candidates:
-                        if freed_in_capacity_check >= bytes_to_free:
-                            break
-                            
-                        source_id, quality, rel_path, file_size, cached_at = row
+                    if current_size > limit_bytes:
+                        bytes_to_free = current_size - limit_bytes
+                        logger.info(
+                            "💾 Cache over capacity (%s > %sGB). Need to free %s.",
+                            _fmt_gb(current_size), capacity_gb, _fmt_gb(bytes_to_free)
+                        )
                         
-                        full_path = os.path.join(os.getcwd(), rel_path)
-                        delete_cache_entry(source_id, quality)
+                        # Oldest first, only as many rows as needed to cover bytes_to_free.
+                        # Manual 'keep_forever' is respected even over capacity.
+                        cursor.execute("""
+                            SELECT id, media_path, cached_at FROM (
+                                SELECT e.id, e.media_path, e.cached_at,
+                                       COALESCE(e.file_size, 0) AS size,
+                                       SUM(COALESCE(e.file_size, 0)) OVER (ORDER BY e.cached_at ASC, e.id ASC) AS cumulative
+                                FROM media_cache_entries e
+                                LEFT JOIN video_meta vm ON e.source_id = vm.source_id
+                                WHERE vm.cache_policy IS NOT 'keep_forever'
+                            )
+                            WHERE cumulative - size < ?
+                            ORDER BY cached_at ASC, id ASC
+                        """, (bytes_to_free,))
+                        victims = cursor.fetchall()
                         
-                        if os.path.exists(full_path):
-                            try:
-                                size = os.path.getsize(full_path)
-                                os.remove(full_path)
-                                freed_in_capacity_check += size
-                                freed_bytes += size
-                                deleted_count += 1
-                                logger.info(f"🗑️ GC capacity cleanup: {rel_path} (Oldest: {cached_at})")
-                            except Exception as e:
-                                logger.error(f"❌ GC capacity failed to delete {full_path}: {e}")
-                                
-                    logger.info(f"💾 Capacity cleanup finished. Freed {fmt(freed_in_capacity_check)}.")
-
+                        on_disk = [v for v in victims if os.path.basename(v[1]) in snap]
+                        results = _bulk_unlink([os.path.basename(rel_path) for _, rel_path, _ in on_disk])
+                        
+                        deleted = []
+                        phase_freed = 0
+                        for (entry_id, rel_path, cached_at), removed in zip(on_disk, results):
+                            if removed:
+                                phase_freed += snap.pop(os.path.basename(rel_path), 0)
+                                deleted.append(rel_path)
+                        freed_bytes += phase_freed
+                        deleted_count += len(deleted)
+                        
+                        cursor.executemany(
+                            "DELETE FROM media_cache_entries WHERE id = ?",
+                            [(entry_id,) for entry_id, _, _ in victims]
+                        )
+                        _log_gc_phase("💾 GC capacity cleanup (oldest first)", deleted, phase_freed)
+            
+            conn.commit()
+        finally:
+            conn.close()
+        
+        _invalidate_find_cache()
         return deleted_count, freed_bytes
 
     @staticmethod
@@ -522,37 +807,29 @@ class MediaCacheService:
         
         for entry in entries:
             rel_path = entry['media_path']
-            full_path = os.path.join(os.getcwd(), rel_path)
+            full_path = CWD_PREFIX + rel_path
             
-            if os.path.exists(full_path):
-                try:
-                    os.remove(full_path)
-                    logger.info(f"🗑️ Deleted cache [{entry['quality']}] for {source_id}: {full_path}")
-                    deleted = True
-                except Exception as e:
-                    logger.error(f"❌ Failed to delete cache {full_path}: {e}")
+            if _safe_unlink(full_path):
+                logger.info(f"🗑️ Deleted cache [{entry['quality']}] for {source_id}: {full_path}")
+                deleted = True
         
         # Remove all DB entries
         delete_all_cache_entries(source_id)
+        _invalidate_find_cache(source_id)
         return deleted
 
     next_gc_time = None
 
     @staticmethod
-    def get_stats():
+    def get_stats(snap: dict = None):
         """Get cache statistics. v9: Uses media_cache_entries for DB stats, filesystem for actual size."""
         db_stats = get_cache_stats()
         
         # Also scan filesystem for real totals (catches orphans)
-        fs_count = 0
-        fs_size = 0
-        
-        if os.path.exists(settings.MEDIA_CACHE_DIR):
-            for f in os.listdir(settings.MEDIA_CACHE_DIR):
-                fp = os.path.join(settings.MEDIA_CACHE_DIR, f)
-                if os.path.isfile(fp):
-                    fs_count += 1
-                    fs_size += os.path.getsize(fp)
+        if snap is None:
+            snap = MediaCacheService._snapshot_cache_dir()
+        fs_count = len(snap)
+        fs_size = sum(snap.values())
         
         return {
             "file_count": db_stats['total_count'],
@@ -568,56 +845,60 @@ class MediaCacheService:
         }
 
     @staticmethod
-    def scan_integrity():
+    def scan_integrity(snap: dict = None):
         """
         Scan for integrity issues.
+        Args:
+            snap: Optional cache dir snapshot from _snapshot_cache_dir()
         Returns:
             dict: {
                 "db_orphans": [{"id", "source_id", "quality", "media_path", "full_path"}],
                 "fs_orphans": [{"filename", "path", "size"}]
             }
         """
-        db_orphans = []
-        fs_orphans = []
+        if snap is None:
+            snap = MediaCacheService._snapshot_cache_dir()
         
         conn = get_connection()
+        try:
+            return MediaCacheService._scan_integrity_cached(conn, snap)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _scan_integrity_cached(conn, snap: dict):
+        """scan_integrity() body, reusing an open connection and a dir snapshot."""
         cursor = conn.cursor()
-        
-        # 1. DB Orphans (Entries → Missing File)
         cursor.execute("SELECT id, source_id, quality, media_path FROM media_cache_entries")
-        all_entries = cursor.fetchall()
-        
-        valid_paths = set()
+        all_entries = [(row, os.path.basename(row[3])) for row in cursor.fetchall()]
         
-        for entry in all_entries:
-            entry_id, source_id, quality, rel_path = entry
-            full_path = os.path.join(os.getcwd(), rel_path)
-            valid_paths.add(os.path.normpath(rel_path))
-            
-            if not os.path.exists(full_path):
-                db_orphans.append({
-                    "id": entry_id,
-                    "source_id": source_id,
-                    "quality": quality,
-                    "media_path": rel_path,
-                    "full_path": full_path
-                })
+        # Cache files live directly in MEDIA_CACHE_DIR: compare names as sets
+        fs_names = snap.keys()
+        db_names = {filename for _, filename in all_entries}
         
-        conn.close()
+        # 1. DB Orphans (Entries → Missing File)
+        db_orphans = [
+            {
+                "id": entry_id,
+                "source_id": source_id,
+                "quality": quality,
+                "media_path": rel_path,
+                "full_path": CWD_PREFIX + rel_path
+            }
+            for (entry_id, source_id, quality, rel_path), filename in all_entries
+            if filename not in fs_names
+        ]
         
         # 2. FS Orphans (File → Missing Entry)
-        if os.path.exists(settings.MEDIA_CACHE_DIR):
-            for filename in os.listdir(settings.MEDIA_CACHE_DIR):
-                full_path = os.path.join(settings.MEDIA_CACHE_DIR, filename)
-                rel_path = os.path.join("data", "media_cache", filename)
-                
-                if os.path.isfile(full_path) and os.path.normpath(rel_path) not in valid_paths:
-                    fs_orphans.append({
-                        "filename": filename,
-                        "path": full_path,
-                        "size": os.path.getsize(full_path)
-                    })
-                    
+        fs_orphans = [
+            {
+                "filename": filename,
+                "path": _CACHE_DIR_PREFIX + filename,
+                "size": snap[filename]
+            }
+            for filename in sorted(fs_names - db_names)
+        ]
+        
         return {
             "db_orphans": db_orphans,
             "fs_orphans": fs_orphans
@@ -631,23 +912,30 @@ class MediaCacheService:
             target_ids: Optional list of IDs to delete. If None, delete all found.
         Returns: count
         """
-        report = MediaCacheService.scan_integrity()
-        candidates = report['db_orphans']
-        
-        count = 0
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        for item in candidates:
-            if target_ids is not None and item['id'] not in target_ids:
-                continue
-                
-            cursor.execute("DELETE FROM media_cache_entries WHERE id = ?", (item['id'],))
-            count += 1
-            
-        conn.commit()
-        conn.close()
-        return count
+        try:
+            report = MediaCacheService._scan_integrity_cached(conn, MediaCacheService._snapshot_cache_dir())
+            return MediaCacheService._delete_db_orphans_from_report(report, conn, target_ids)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _delete_db_orphans_from_report(report: dict, conn, target_ids: list[int] = None):
+        """Delete the report's DB orphans on an open connection. Returns count."""
+        ids = [
+            item['id'] for item in report['db_orphans']
+            if target_ids is None or item['id'] in target_ids
+        ]
+        if not ids:
+            return 0
+        
+        _begin_write(conn)
+        with conn:
+            for chunk in chunked(ids):
+                placeholders = ','.join('?' * len(chunk))
+                conn.execute(f"DELETE FROM media_cache_entries WHERE id IN ({placeholders})", chunk)
+        _invalidate_find_cache()
+        return len(ids)
 
     @staticmethod
     def delete_fs_orphans(target_filenames: list[str] = None):
@@ -658,22 +946,22 @@ class MediaCacheService:
         Returns: (count, freed_bytes)
         """
         report = MediaCacheService.scan_integrity()
-        candidates = report['fs_orphans']
+        return MediaCacheService._delete_fs_orphans_from_report(report, target_filenames)
+
+    @staticmethod
+    def _delete_fs_orphans_from_report(report: dict, target_filenames: list[str] = None):
+        """Delete the report's FS orphans. Returns (count, freed_bytes)."""
+        items = [
+            item for item in report['fs_orphans']
+            if target_filenames is None or item['filename'] in target_filenames
+        ]
         
         count = 0
         freed = 0
-        
-        for item in candidates:
-            if target_filenames is not None and item['filename'] not in target_filenames:
-                continue
-            
-            try:
-                if os.path.exists(item['path']):
-                    os.remove(item['path'])
-                    count += 1
-                    freed += item['size']
-            except Exception as e:
-                logger.error(f"❌ Failed to delete orphan {item['path']}: {e}")
+        for item, removed in zip(items, _bulk_unlink([item['filename'] for item in items])):
+            if removed:
+                count += 1
+                freed += item['size']
                 
         return count, freed
 
@@ -682,26 +970,28 @@ class MediaCacheService:
         """
         Legacy wrapper for full sync.
         Automatically cleans DB orphans. Optionally cleans FS orphans.
+        Scans once; removing DB orphans (rows whose file is gone) cannot
+        change the set of FS orphans, so the same report drives both steps.
         """
-        # 1. Clean all DB orphans
-        db_cleaned = MediaCacheService.delete_db_orphans()
-        
-        # 2. Clean FS orphans if requested
-        orphans_found = 0
         fs_cleaned_count = 0
         fs_cleaned_bytes = 0
         
-        report = MediaCacheService.scan_integrity()
+        conn = get_connection()
+        try:
+            report = MediaCacheService._scan_integrity_cached(conn, MediaCacheService._snapshot_cache_dir())
+            
+            # 1. Clean all DB orphans
+            db_cleaned = MediaCacheService._delete_db_orphans_from_report(report, conn)
+        finally:
+            conn.close()
+        
+        # 2. Clean FS orphans if requested
         orphans_found = len(report['fs_orphans'])
         
         details = []
-        # Add DB actions to details (reconstructed for legacy response compatibility)
-        # Scan already re-ran, so we don't have the exact IDs deleted unless we tracked them.
-        # For legacy "sync", just reporting counts/summaries is usually enough or we can't easily reconstruction.
-        # We'll just return summary/counts.
         
         if delete_orphans:
-            fs_cleaned_count, fs_cleaned_bytes = MediaCacheService.delete_fs_orphans()
+            fs_cleaned_count, fs_cleaned_bytes = MediaCacheService._delete_fs_orphans_from_report(report)
             
         # Construct summary details for UI toast
         if db_cleaned > 0:
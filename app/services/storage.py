@@ -3,15 +3,87 @@ import shutil
 import uuid
 from typing import Optional
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 from app.core.logger import logger
 
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _copy_hashed(src, dst, hasher) -> None:
+    """Copy src into dst in 4 MiB chunks, feeding each chunk to hasher in the same pass."""
+    while True:
+        chunk = src.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            return
+        hasher.update(chunk)
+        dst.write(chunk)
+
+
+# Anonymous temp files (O_TMPFILE) are linked into place via /proc/self/fd
+_HAS_TMPFILE = hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd")
+
+
+def _write_atomic(file_path: str, write) -> None:
+    """
+    Write file_path via write(f) so it only appears once complete.
+    On Linux the data goes to an unnamed O_TMPFILE that is linked in at the
+    end, so an interrupted write never has a directory entry. Elsewhere (or
+    if the fs lacks O_TMPFILE) a hidden .part file is renamed over it.
+    """
+    dir_path = os.path.dirname(file_path) or "."
+    
+    if _HAS_TMPFILE:
+        try:
+            fd = os.open(dir_path, os.O_TMPFILE | os.O_RDWR, 0o644)
+        except OSError:
+            fd = None
+        if fd is not None:
+            with os.fdopen(fd, "w+b") as f:
+                write(f)
+                f.flush()
+                dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    # dst_dir_fd makes os.link use linkat(AT_SYMLINK_FOLLOW),
+                    # which resolves the /proc magic link to the open file
+                    os.link(f"/proc/self/fd/{fd}", os.path.basename(file_path), dst_dir_fd=dir_fd)
+                    return
+                except OSError:
+                    # Linking refused: replay the finished data via a .part file
+                    f.seek(0)
+                    write = lambda out: shutil.copyfileobj(f, out, COPY_CHUNK_SIZE)
+                    _write_part(file_path, dir_path, write)
+                    return
+                finally:
+                    os.close(dir_fd)
+    
+    _write_part(file_path, dir_path, write)
+
+
+def _write_part(file_path: str, dir_path: str, write) -> None:
+    """_write_atomic() fallback: hidden .part file, then os.replace()."""
+    part_path = os.path.join(dir_path, f".{uuid.uuid4().hex}.part")
+    try:
+        with open(part_path, "wb") as f:
+            write(f)
+        os.replace(part_path, file_path)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+
+
 class StorageService:
     @staticmethod
-    def save_upload_file(file: UploadFile, filename: Optional[str] = None) -> str:
+    async def save_upload_file(file: UploadFile, filename: Optional[str] = None, hasher=None) -> str:
         """
         Save an uploaded file to the temporary uploads directory.
+        The copy runs in the threadpool so the event loop is not blocked, and
+        the file only appears at file_path once fully written.
+        If a hashlib hasher is given it is fed the content during the copy.
         Returns the absolute file path.
         """
         if not filename:
@@ -21,8 +93,11 @@ class StorageService:
         file_path = os.path.join(settings.TEMP_UPLOADS_DIR, filename)
         
         try:
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            if hasher is None:
+                write = lambda buffer: shutil.copyfileobj(file.file, buffer, COPY_CHUNK_SIZE)
+            else:
+                write = lambda buffer: _copy_hashed(file.file, buffer, hasher)
+            await run_in_threadpool(_write_atomic, file_path, write)
             logger.info(f"💾 File saved: {file_path}")
             return file_path
         except Exception as e:
@@ -45,15 +120,15 @@ class StorageService:
         return os.path.join(settings.TEMP_UPLOADS_DIR, filename)
 
     @staticmethod
-    def save_cover_image(content: bytes, filename: str) -> Optional[str]:
+    async def save_cover_image(content: bytes, filename: str) -> Optional[str]:
         """
         Save binary content as a cover image.
         Returns the absolute file path or None on failure.
         """
         file_path = os.path.join(settings.COVERS_DIR, filename)
+        
         try:
-            with open(file_path, "wb") as f:
-                f.write(content)
+            await run_in_threadpool(_write_atomic, file_path, lambda f: f.write(content))
             logger.info(f"🖼️ Cover saved: {file_path}")
             return file_path
         except Exception as e:
@@ -65,11 +140,14 @@ class StorageService:
         """
         Safely remove a file if it exists.
         """
-        if path and os.path.exists(path):
-            try:
-                os.remove(path)
-                logger.debug(f"🗑️ Cleaned up file: {path}")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to cleanup file {path}: {e}")
+        if not path:
+            return
+        try:
+            os.remove(path)
+            logger.debug(f"🗑️ Cleaned up file: {path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to cleanup file {path}: {e}")
 
 storage = StorageService()
@@ -2,18 +2,45 @@
 Transcription Service Package
 Exposes source-specific transcription functions that wrap the unified pipeline.
 """
+import os
 from typing import Optional
-from app.services.transcription.pipeline import run_transcription_pipeline
-from app.services.transcription.downloaders import (
-    make_bilibili_downloader,
-    make_youtube_downloader,
-    make_douyin_downloader,
-    make_network_downloader
-)
+from starlette.concurrency import run_in_threadpool
+
 from app.utils.progress import ProgressHelper
 from app.core.task_manager import task_manager
-import os
+from app.core.config import settings
 from app.core.logger import logger
+from app.db import get_system_config_cached
+from app.utils.source_utils import BV_PART_RE, P_PARAM_RE
+
+
+def _parse_bilibili_ref(source_id: str, url: str) -> tuple:
+    """
+    Extract (bvid, page_index) from a normalized source_id (e.g. BVxxx_p2),
+    falling back to the URL (e.g. .../BVxxx?p=2). page_index defaults to 1.
+    """
+    bvid, page = None, 1
+    
+    # Try source_id first: one match yields both BVID and page (e.g. "_p2")
+    if source_id:
+        match = BV_PART_RE.match(source_id)
+        if match:
+            bvid = match.group(1)
+            if match.group(2):
+                page = int(match.group(2)[2:])
+    
+    if url:
+        if not bvid:
+            match = BV_PART_RE.search(url)
+            if match:
+                bvid = match.group(1)
+        # Fallback to URL (e.g. ?p=2); an explicit _p1 is just the default page
+        if page == 1:
+            match = P_PARAM_RE.search(url)
+            if match:
+                page = int(match.group(1))
+    
+    return bvid, page
 
 async def process_bilibili_transcription(
     transcription_id: int,
@@ -33,6 +60,11 @@ async def process_bilibili_transcription(
     auto_analyze_strip_subtitle: bool = True
 ):
     """Process a Bilibili video for transcription"""
+    # Pipeline (ASR client, UVR) and downloaders (yt-dlp, requests) are imported
+    # on first use so they stay off the app startup path
+    from app.services.transcription.pipeline import run_transcription_pipeline
+    from app.services.transcription.downloaders import make_bilibili_downloader
+    from app.downloaders.bilibili import download_bilibili_subtitles
     # Create progress helper for downloader
     # Pipeline handles 0-30% for download
     dl_progress = ProgressHelper(task_manager, transcription_id, 0, 30)
@@ -42,40 +74,13 @@ async def process_bilibili_transcription(
     pre_asr_hook = None
     if not force_transcription:
         async def check_subs(tid):
-            from app.downloaders.bilibili import download_bilibili_subtitles
-            from app.db import get_system_config
-            from starlette.concurrency import run_in_threadpool
-            import re
-            
             task_manager.update_progress(tid, 5, "Checking for subtitles...")
             
             # Get SESSDATA cookie for AI subtitle access
-            sessdata = get_system_config('bilibili_sessdata')
-            
-            # Parse page index from source_id or URL
-            page_index = 1
-            
-            # Try source_id first (e.g. BVxxx_p2)
-            if source_id:
-                 p_match = re.search(r"_p(\d+)", source_id)
-                 if p_match:
-                     page_index = int(p_match.group(1))
+            sessdata = get_system_config_cached('bilibili_sessdata')
             
-            # Fallback to URL (e.g. ?p=2)
-            if page_index == 1 and url:
-                 p_match = re.search(r"[?&]p=(\d+)", url)
-                 if p_match:
-                     page_index = int(p_match.group(1))
-            
-            # Extract BVID
-            bvid = None
-            if source_id and source_id.startswith("BV"):
-                bvid = source_id.split("_p")[0]
-            elif url:
-                match = re.search(r"(BV[a-zA-Z0-9]{10})", url)
-                if match:
-                    bvid = match.group(1)
-                    
+            # BVID and page index from source_id (e.g. BVxxx_p2) or URL (e.g. ?p=2)
+            bvid, page_index = _parse_bilibili_ref(source_id, url)
             if not bvid:
                 return None
 
@@ -126,10 +131,10 @@ async def process_youtube_transcription(
     auto_analyze_strip_subtitle: bool = True
 ):
     """Process a YouTube video for transcription"""
-    from app.core.config import settings
-    from app.db import get_system_config
-    
-    proxy = get_system_config('proxy_url')
+    from app.services.transcription.pipeline import run_transcription_pipeline
+    from app.services.transcription.downloaders import make_youtube_downloader
+    from app.downloaders.youtube import download_youtube_subtitles
+    proxy = get_system_config_cached('proxy_url')
     dl_progress = ProgressHelper(task_manager, transcription_id, 0, 30)
     
     downloader = make_youtube_downloader(url, proxy, dl_progress)
@@ -137,7 +142,6 @@ async def process_youtube_transcription(
     pre_asr_hook = None
     if not force_transcription:
         async def check_subs(tid):
-            from app.downloaders.youtube import download_youtube_subtitles
             task_manager.update_progress(tid, 5, "Checking for subtitles...")
             # Check cache skip? Logic handled in pipeline (only calls hook if not cached)
             sub_path, sub_content = await run_in_threadpool(
@@ -154,9 +158,6 @@ async def process_youtube_transcription(
             return None
         pre_asr_hook = check_subs
 
-    from starlette.concurrency import run_in_threadpool
-    import os
-
     # Use normalized source_id as cache key if available, otherwise fallback to URL
     cache_key = source_id or url
 
@@ -192,6 +193,8 @@ async def process_douyin_transcription(
     auto_analyze_strip_subtitle: bool = True
 ):
     """Process a Douyin video for transcription"""
+    from app.services.transcription.pipeline import run_transcription_pipeline
+    from app.services.transcription.downloaders import make_douyin_downloader, make_network_downloader
     dl_progress = ProgressHelper(task_manager, transcription_id, 0, 30)
     
     # Prefer source_id for cache key
@@ -235,8 +238,10 @@ async def process_network_transcription(
     auto_analyze_strip_subtitle: bool = True
 ):
     """Process a direct network URL for transcription"""
+    from app.services.transcription.pipeline import run_transcription_pipeline
+    from app.services.transcription.downloaders import make_network_downloader
     dl_progress = ProgressHelper(task_manager, transcription_id, 0, 30)
-    downloader = make_network_downloader(file_path)
+    downloader = make_network_downloader(file_path, url)
     
     # Use normalized source_id as cache key if available
     cache_key = source_id or url
@@ -277,6 +282,7 @@ async def process_file_transcription(
     auto_analyze_strip_subtitle: bool = True
 ):
     """Process a local file upload for transcription"""
+    from app.services.transcription.pipeline import run_transcription_pipeline
     # File is already on disk.
     async def downloader(tid):
         return file_path
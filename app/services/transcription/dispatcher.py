@@ -7,16 +7,20 @@ Handles the orchestration of transcription requests:
 4. Creates transcription record
 5. Dispatches background task
 """
+import time
+import asyncio
+import dataclasses
 from fastapi import BackgroundTasks
 from starlette.concurrency import run_in_threadpool
 from app.db import (
-    save_transcription,
-    upsert_video_meta,
+    create_transcription_atomic,
     get_system_config
 )
 from app.asr.client import asr_client
 from app.utils.source_utils import normalize_source_id
 from app.core.logger import logger
+from app.core.task_queue import task_queue
+from app.core.ttl_cache import TTLCache
 from app.services.transcription import (
     process_bilibili_transcription,
     process_youtube_transcription,
@@ -26,7 +30,58 @@ from app.services.transcription import (
 )
 from app.api.v1.endpoints.covers import download_and_cache_cover
 
+# Title prefixes the request layer uses when no real metadata is available
+_FALLBACK_TITLE_PREFIXES = ("Douyin ", "YouTube ")
+_GENERIC_TITLE_PREFIXES = _FALLBACK_TITLE_PREFIXES + ("网络媒体 ",)
+_EXTERNAL_COVER_PREFIXES = ("http", "//")
+
+
+def _is_generic_title(title: str) -> bool:
+    """Whether a title is a generic fallback rather than real metadata."""
+    return (not title) or title.startswith(_GENERIC_TITLE_PREFIXES) or title == "未知来源"
+
+
+def _preserve_rich_meta(existing_meta, meta: dict) -> dict:
+    """
+    Prevent overwriting rich metadata with generic fallbacks.
+    Runs inside create_transcription_atomic's transaction.
+    """
+    if not existing_meta:
+        return meta
+    
+    source_id = existing_meta['source_id']
+    old_title = existing_meta['video_title']
+    old_cover = existing_meta['video_cover']
+    
+    # If new is generic but old is rich, preserve old!
+    if _is_generic_title(meta['video_title']) and old_title and not (old_title.startswith(_FALLBACK_TITLE_PREFIXES) or old_title == "未知来源"):
+        logger.info(f"🛡️ Preserving rich video_title against generic overwrite for {source_id}")
+        meta['video_title'] = old_title
+        
+    # Preserve cover if incoming is empty/missing but old exists
+    if not meta['video_cover'] and old_cover:
+        logger.info(f"🛡️ Preserving existing video_cover for {source_id}")
+        meta['video_cover'] = old_cover
+    
+    return meta
+
+
+# Engine label changes only with ASR config or worker health; a short TTL is fine
+_ASR_INFO_TTL = 30.0
+_asr_info_cache = TTLCache(_ASR_INFO_TTL)
+
+
+def invalidate_asr_info_cache():
+    """Force the next get_current_asr_info() to re-resolve."""
+    _asr_info_cache.invalidate()
+
+
 def get_current_asr_info():
+    """Resolve ASR engine info (cached for _ASR_INFO_TTL seconds)"""
+    return _asr_info_cache.get(None, _resolve_asr_info)
+
+
+def _resolve_asr_info():
     """Resolve ASR engine info from settings and client availability"""
     try:
         engine_key = asr_client.select_worker()
@@ -55,6 +110,81 @@ def get_current_asr_info():
     except Exception:
         return "none", "No Engine Available"
 
+# --- Per-source positional args for process_*_transcription ---
+# Each builder takes create_and_dispatch's locals and returns (args, extra_kwargs);
+# the shared keyword args (source_id, auto_analyze_*, ...) are added by the caller.
+
+def _bilibili_args(c: dict):
+    return (c['original_source'], c['segment_start'] or 0.0, c['segment_end'], c['task_type'],
+            c['use_uvr'], c['language'], c['prompt'], c['output_format']), {}
+
+def _youtube_args(c: dict):
+    return (c['original_source'], c['task_type'], c['use_uvr'], c['language'],
+            c['prompt'], c['output_format']), {}
+
+def _douyin_args(c: dict):
+    # Douyin requires direct_url
+    return (c['direct_url'], c['task_type'], c['use_uvr'], c['output_format']), \
+           {"local_file_path": c['local_file_path']}
+
+def _network_args(c: dict):
+    # Network file_path is downloaded by the caller, or None when the cache is reused
+    return (c['original_source'], c['file_path'], c['task_type'], c['use_uvr'],
+            c['language'], c['prompt'], c['output_format']), {}
+
+def _file_args(c: dict):
+    return (c['file_path'], c['task_type'], c['file_filename'], c['source_type'], c['cover'],
+            c['covers_dir'], c['use_uvr'], c['language'], c['prompt'], c['output_format']), {}
+
+_FILE_ENTRY = (process_file_transcription, _file_args)
+
+_DISPATCH = {
+    'bilibili': (process_bilibili_transcription, _bilibili_args),
+    'youtube': (process_youtube_transcription, _youtube_args),
+    'douyin': (process_douyin_transcription, _douyin_args),
+    'network': (process_network_transcription, _network_args),
+    'file': _FILE_ENTRY,
+    'video': _FILE_ENTRY,
+    'audio': _FILE_ENTRY,
+}
+
+
+@dataclasses.dataclass(slots=True)
+class DispatchParams:
+    """
+    Keyword arguments for create_and_dispatch, as built by the request
+    service's prepare_* helpers. Defaults mirror create_and_dispatch.
+    """
+    source_id: str
+    original_source: str
+    source_type: str
+    title: str
+    cover: str
+    task_type: str = "transcribe"
+    bookmark_only: bool = False
+    use_uvr: bool = False
+    language: str = "zh"
+    prompt: str = None
+    auto_analyze_prompt: str = None
+    auto_analyze_prompt_id: int = None
+    auto_analyze_strip_subtitle: bool = True
+    output_format: str = None
+    stream_url: str = None
+    segment_start: float = None
+    segment_end: float = None
+    file_path: str = None
+    direct_url: str = None
+    covers_dir: str = None
+    file_filename: str = None
+    quality: str = "best"
+    local_file_path: str = None
+    only_get_subtitles: bool = False
+    force_transcription: bool = False
+
+    def as_kwargs(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 async def create_and_dispatch(
     background_tasks: BackgroundTasks,
     *,
@@ -82,6 +212,7 @@ async def create_and_dispatch(
     direct_url: str = None,
     # For UploadFile
     covers_dir: str = None,
+    file_filename: str = None,
     quality: str = "best",
     local_file_path: str = None,
     only_get_subtitles: bool = False,
@@ -91,56 +222,50 @@ async def create_and_dispatch(
     Unified entry point for creating and dispatching transcription tasks.
     """
     
-    # 1. Resolve Engine
-    engine_type, model_name = get_current_asr_info()
+    # 3. Process Cover (Download & Cache if external)
+    # Started first so the network round-trip overlaps engine/source resolution
+    cover_task = None
+    if cover and cover.startswith(_EXTERNAL_COVER_PREFIXES):
+        # Run in threadpool to avoid blocking event loop
+        cover_task = asyncio.create_task(run_in_threadpool(download_and_cache_cover, cover))
+    
+    # 1. Resolve Engine (may read the DB; awaiting also lets the cover task start)
+    engine_type, model_name = await run_in_threadpool(get_current_asr_info)
     
     # 2. Normalize Source ID
     normalized_source = normalize_source_id(source_id, source_type=source_type)
     
-    # 3. Process Cover (Download & Cache if external)
-    if cover and (cover.startswith("http") or cover.startswith("//")):
+    if cover_task:
         try:
-            # Run in threadpool to avoid blocking event loop
-            local_cover = await run_in_threadpool(download_and_cache_cover, cover)
+            local_cover = await cover_task
             if local_cover:
                 cover = local_cover
         except Exception as e:
             logger.warning(f"Failed to pre-cache cover {cover}: {e}")
 
-    # 3.5 Prevent overwriting rich metadata with generic fallbacks
-    from app.db import get_video_meta
-    existing_meta = get_video_meta(normalized_source)
-    if existing_meta:
-        old_title = existing_meta['video_title']
-        old_cover = existing_meta['video_cover']
-        
-        # Identify if the incoming title is a generic fallback or empty
-        is_generic = (not title) or \
-                     title.startswith("Douyin ") or \
-                     title.startswith("YouTube ") or \
-                     title.startswith("网络媒体 ") or \
-                     title == "未知来源"
-                     
-        # If new is generic but old is rich, preserve old!
-        if is_generic and old_title and not (old_title.startswith("Douyin ") or old_title.startswith("YouTube ") or old_title == "未知来源"):
-            logger.info(f"🛡️ Preserving rich video_title against generic overwrite for {normalized_source}")
-            title = old_title
-            
-        # Preserve cover if incoming is empty/missing but old exists
-        if not cover and old_cover:
-            logger.info(f"🛡️ Preserving existing video_cover for {normalized_source}")
-            cover = old_cover
-
-    # 4. Save Metadata
+    # 3.5 / 4 / 6. Save metadata (preserving rich fields) and, for normal
+    # transcriptions, the transcription record in one transaction.
     # For file uploads, source_id might be hash, original_source is filename
-    upsert_video_meta(
-        source_id=normalized_source,
-        video_title=title,
-        video_cover=cover,
-        source_type=source_type,
-        stream_url=stream_url,
-        reset_policy=True,
-        original_source=original_source
+    is_transcription = not bookmark_only and task_type != "cache_only"
+    transcription_id = create_transcription_atomic(
+        normalized_source,
+        dict(
+            video_title=title,
+            video_cover=cover,
+            source_type=source_type,
+            stream_url=stream_url,
+            reset_policy=True,
+            original_source=original_source
+        ),
+        tx=dict(
+            raw_text="",
+            asr_model=model_name,
+            is_subtitle=(task_type == "subtitle"),
+            status="pending",
+            segment_start=segment_start if segment_start is not None else 0.0,
+            segment_end=segment_end
+        ) if is_transcription else None,
+        merge=_preserve_rich_meta
     )
 
     # 5. Handle Bookmark Only - NO Transcription Record
@@ -157,12 +282,8 @@ async def create_and_dispatch(
     if task_type == "cache_only":
         from app.services.cache_task import process_cache_task
         
-        # Update status to downloading/pending
-        upsert_video_meta(source_id=normalized_source)
-        
         # Generate Ephemeral ID (negative timestamp) to avoid DB collision
         # Used ONLY for TaskManager progress tracking in memory.
-        import time
         transcription_id = -int(time.time() * 1000)
         
         background_tasks.add_task(
@@ -181,111 +302,26 @@ async def create_and_dispatch(
             "message": "Cache task queued"
         }
     
-    # 6. Save Transcription Record (Normal Transcription)
-    transcription_id = save_transcription(
-        source=normalized_source,
-        raw_text="",
-        asr_model=model_name,
-        is_subtitle=(task_type == "subtitle"),
-        status="pending",
-        segment_start=segment_start if segment_start is not None else 0.0,
-        segment_end=segment_end
-    )
-        
-    # Dispatch based on type
-    if source_type == 'bilibili':
-        background_tasks.add_task(
-            process_bilibili_transcription,
+    # Dispatch based on type (bounded worker pool, see app.core.task_queue)
+    entry = _DISPATCH.get(source_type)
+    if entry:
+        process_fn, build_args = entry
+        args, extra_kwargs = build_args(locals())
+        await task_queue.put(
             transcription_id,
-            original_source, # url
-            segment_start or 0.0,
-            segment_end, # range_end
-            task_type,
-            use_uvr,
-            language,
-            prompt,
-            output_format,
-            source_id=normalized_source,
-            only_get_subtitles=only_get_subtitles,
-            force_transcription=force_transcription,
-            auto_analyze_prompt=auto_analyze_prompt,
-            auto_analyze_prompt_id=auto_analyze_prompt_id,
-            auto_analyze_strip_subtitle=auto_analyze_strip_subtitle
-        )
-    elif source_type == 'youtube':
-        background_tasks.add_task(
-            process_youtube_transcription,
-            transcription_id,
-            original_source, # url
-            task_type,
-            use_uvr,
-            language,
-            prompt,
-            output_format,
-            source_id=normalized_source,
-            only_get_subtitles=only_get_subtitles,
-            force_transcription=force_transcription,
-            auto_analyze_prompt=auto_analyze_prompt,
-            auto_analyze_prompt_id=auto_analyze_prompt_id,
-            auto_analyze_strip_subtitle=auto_analyze_strip_subtitle
-        )
-    elif source_type == 'douyin':
-        # Douyin requires direct_url
-        background_tasks.add_task(
-            process_douyin_transcription,
-            transcription_id,
-            direct_url,
-            task_type,
-            use_uvr,
-            output_format,
-            source_id=normalized_source,
-            local_file_path=local_file_path,
-            only_get_subtitles=only_get_subtitles,
-            force_transcription=force_transcription,
-            auto_analyze_prompt=auto_analyze_prompt,
-            auto_analyze_prompt_id=auto_analyze_prompt_id,
-            auto_analyze_strip_subtitle=auto_analyze_strip_subtitle
-        )
-    elif source_type == 'network':
-        # Network requires file_path (downloaded by caller/helper)
-        background_tasks.add_task(
-            process_network_transcription,
-            transcription_id,
-            original_source, # url
-            file_path,
-            task_type,
-            use_uvr,
-            language,
-            prompt,
-            output_format,
-            source_id=normalized_source,
-            only_get_subtitles=only_get_subtitles,
-            force_transcription=force_transcription,
-            auto_analyze_prompt=auto_analyze_prompt,
-            auto_analyze_prompt_id=auto_analyze_prompt_id,
-            auto_analyze_strip_subtitle=auto_analyze_strip_subtitle
-        )
-    elif source_type == 'file' or source_type == 'video' or source_type == 'audio':
-         background_tasks.add_task(
-            process_file_transcription,
-            transcription_id,
-            file_path,
-            task_type,
-            file_filename,
-            source_type,
-            cover,
-            covers_dir,
-            use_uvr,
-            language,
-            prompt,
-            output_format,
+            process_fn,
+            *args,
+            meta={"title": f"[{source_type}] Queued", "source": normalized_source},
             source_id=normalized_source,
             only_get_subtitles=only_get_subtitles,
             force_transcription=force_transcription,
             auto_analyze_prompt=auto_analyze_prompt,
             auto_analyze_prompt_id=auto_analyze_prompt_id,
-            auto_analyze_strip_subtitle=auto_analyze_strip_subtitle
+            auto_analyze_strip_subtitle=auto_analyze_strip_subtitle,
+            **extra_kwargs
         )
+    else:
+        logger.warning(f"⚠️ No processor for source type '{source_type}', task {transcription_id} not dispatched")
 
     return {
         "id": transcription_id,
@@ -3,13 +3,17 @@ Downloaders for Transcription Service
 Contains factory functions that return async callables for downloading media.
 """
 import os
-from typing import Callable, Awaitable
+import hashlib
+import functools
+from typing import Callable, Awaitable, Optional
+from urllib.parse import urlparse
 from starlette.concurrency import run_in_threadpool
 
 from app.core.logger import logger
 from app.core.config import settings
 from app.utils.progress import ProgressHelper
 from app.core.task_manager import task_manager
+from app.services.media_cache import MediaCacheService
 
 # Clients
 from app.downloaders.bilibili import download_audio
@@ -19,16 +23,19 @@ from app.downloaders.youtube import download_youtube_video, download_youtube_med
 def make_bilibili_downloader(url: str, range_start: float, range_end: float, progress_helper: ProgressHelper) -> Callable[[int], Awaitable[str]]:
     """Factory for Bilibili downloader"""
     async def download(transcription_id: int) -> str:
-        check_cancel_wrapper = lambda tid=None: task_manager.check_cancel(transcription_id)
-        
-        audio_path = await run_in_threadpool(
-            download_audio,
-            url,
-            range_start,
-            range_end,
-            transcription_id,
-            check_cancel_wrapper,
-            progress_helper.get_callback()
+        audio_path = await MediaCacheService.download_once(
+            f"bilibili:{url}:{range_start}:{range_end}",
+            functools.partial(
+                run_in_threadpool,
+                download_audio,
+                url,
+                range_start,
+                range_end,
+                transcription_id,
+                task_manager.check_cancel,
+                progress_helper.get_callback()
+            ),
+            task_id=transcription_id
         )
         if not audio_path:
             raise Exception("Failed to download audio from Bilibili")
@@ -38,16 +45,19 @@ def make_bilibili_downloader(url: str, range_start: float, range_end: float, pro
 def make_youtube_downloader(url: str, proxy: str, progress_helper: ProgressHelper) -> Callable[[int], Awaitable[str]]:
     """Factory for YouTube downloader"""
     async def download(transcription_id: int) -> str:
-        check_cancel_wrapper = lambda tid=None: task_manager.check_cancel(transcription_id)
-        
-        audio_path = await run_in_threadpool(
-            download_youtube_video,
-            url,
-            settings.TEMP_UPLOADS_DIR,
-            proxy,
-            transcription_id,
-            check_cancel_wrapper,
-            progress_helper.get_callback()
+        audio_path = await MediaCacheService.download_once(
+            f"youtube:{url}",
+            functools.partial(
+                run_in_threadpool,
+                download_youtube_video,
+                url,
+                settings.TEMP_UPLOADS_DIR,
+                proxy,
+                transcription_id,
+                task_manager.check_cancel,
+                progress_helper.get_callback()
+            ),
+            task_id=transcription_id
         )
         if not audio_path:
             raise Exception("Failed to download audio from YouTube")
@@ -57,70 +67,111 @@ def make_youtube_downloader(url: str, proxy: str, progress_helper: ProgressHelpe
 def make_douyin_downloader(direct_url: str, source_id: str, progress_helper: ProgressHelper) -> Callable[[int], Awaitable[str]]:
     """Factory for Douyin downloader"""
     async def download(transcription_id: int) -> str:
-        check_cancel_wrapper = lambda tid=None: task_manager.check_cancel(transcription_id)
-        
-        video_path = await run_in_threadpool(
-            download_douyin_video,
-            direct_url,
-            "https://www.douyin.com/",
-            transcription_id,
-            check_cancel_wrapper,
-            progress_helper.get_callback()
+        video_path = await MediaCacheService.download_once(
+            f"douyin:{source_id or direct_url}",
+            functools.partial(
+                run_in_threadpool,
+                download_douyin_video,
+                direct_url,
+                "https://www.douyin.com/",
+                transcription_id,
+                task_manager.check_cancel,
+                progress_helper.get_callback()
+            ),
+            task_id=transcription_id
         )
         if not video_path:
             raise Exception("Failed to download video from Douyin")
         return video_path
     return download
 
-def make_network_downloader(file_path: str) -> Callable[[int], Awaitable[str]]:
+def make_network_downloader(file_path: str, url: str = None) -> Callable[[int], Awaitable[str]]:
     """Factory for Network/File downloader (Identity)"""
     async def download(transcription_id: int) -> str:
-        # File is already downloaded/uploaded by endpoint
-        if not file_path or not os.path.exists(file_path):
-             raise Exception(f"File not found: {file_path}")
+        # File is already downloaded/uploaded by endpoint; a missing file
+        # surfaces with its real errno when the pipeline opens it
+        if not file_path:
+            if url:
+                # Download was skipped because the cached copy looked current,
+                # but the cache entry is gone by now: fetch it after all
+                path, _ = await download_network_file(url, settings.TEMP_UPLOADS_DIR)
+                return path
+            raise Exception(f"File not found: {file_path}")
         return file_path
     return download
 
-def download_network_file(url: str, output_dir: str) -> tuple[str, str]:
+_NETWORK_CHUNK_SIZE = 1024 * 1024
+
+# Content-Type (without parameters) -> file extension
+_MIME_EXT = {
+    "audio/mpeg": ".mp3",
+    "audio/mp3": ".mp3",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/m4a": ".m4a",
+    "audio/x-m4a": ".m4a",
+    "video/webm": ".webm",
+    "video/mp4": ".mp4",
+    "video/x-matroska": ".mkv",
+}
+_KNOWN_EXTS = frozenset(_MIME_EXT.values())
+_VIDEO_EXTS = frozenset({".mp4", ".webm", ".mkv"})
+_network_client = None
+
+
+def _get_network_client():
+    """Shared AsyncClient so concurrent network downloads reuse one pool."""
+    global _network_client
+    if _network_client is None:
+        import httpx
+        _network_client = httpx.AsyncClient(
+            timeout=30,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+        )
+    return _network_client
+
+
+async def close_network_client():
+    """Close the shared AsyncClient (app shutdown); a later call recreates it."""
+    global _network_client
+    client, _network_client = _network_client, None
+    if client is not None:
+        await client.aclose()
+
+
+async def download_network_file(url: str, output_dir: str) -> tuple[str, str]:
     """
-    Synchronously download a file from a URL. 
+    Asynchronously stream a file from a URL to disk.
     Returns (file_path, display_type).
     """
-    import requests
-    import hashlib
-    import os
-    
     try:
         # Stream download to temp file
-        resp = requests.get(url, stream=True, timeout=30, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
-        resp.raise_for_status()
-        
-        # Determine file extension
-        content_type = resp.headers.get("Content-Type", "")
-        ext = ".mp4"  # default
-        if "audio/mpeg" in content_type or url.endswith(".mp3"):
-            ext = ".mp3"
-        elif "audio/wav" in content_type or url.endswith(".wav"):
-            ext = ".wav"
-        elif "audio/m4a" in content_type or url.endswith(".m4a"):
-            ext = ".m4a"
-        elif "video/webm" in content_type or url.endswith(".webm"):
-            ext = ".webm"
-        elif url.endswith(".mp4"):
-            ext = ".mp4"
+        async with _get_network_client().stream("GET", url) as resp:
+            resp.raise_for_status()
             
-        display_type = "video" if ext in [".mp4", ".webm"] else "audio"
-        
-        # Generate a unique filename
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-        filename = f"network_{url_hash}{ext}"
-        file_path = os.path.join(output_dir, filename)
-        
-        with open(file_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
+            # Determine file extension: MIME type first, then the URL path suffix
+            mime = resp.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+            ext = _MIME_EXT.get(mime)
+            if not ext:
+                url_ext = os.path.splitext(urlparse(url).path)[1].lower()
+                ext = url_ext if url_ext in _KNOWN_EXTS else ".mp4"  # default
+                
+            display_type = "video" if ext in _VIDEO_EXTS else "audio"
+            
+            # Generate a unique filename (non-cryptographic: blake2b, 32-bit digest)
+            url_hash = hashlib.blake2b(url.encode(), digest_size=4).hexdigest()
+            filename = f"network_{url_hash}{ext}"
+            file_path = os.path.join(output_dir, filename)
+            
+            # Disk writes go to the threadpool; the socket reads stay on the loop
+            f = await run_in_threadpool(open, file_path, "wb")
+            try:
+                async for chunk in resp.aiter_bytes(_NETWORK_CHUNK_SIZE):
+                    await run_in_threadpool(f.write, chunk)
+            finally:
+                await run_in_threadpool(f.close)
                 
         logger.info(f"✅ Downloaded network file: {file_path} ({display_type})")
         return file_path, display_type
@@ -128,3 +179,18 @@ def download_network_file(url: str, output_dir: str) -> tuple[str, str]:
     except Exception as e:
         logger.error(f"❌ Failed to download network URL: {e}")
         raise e
+
+
+async def probe_network_size(url: str) -> Optional[int]:
+    """
+    HEAD the URL and return its Content-Length in bytes.
+    Returns None when the server does not report one or the probe fails.
+    """
+    try:
+        resp = await _get_network_client().head(url)
+        resp.raise_for_status()
+        length = resp.headers.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+    except Exception as e:
+        logger.debug(f"HEAD probe failed for {url}: {e}")
+        return None
@@ -4,20 +4,34 @@ Unified workflow for Check Cache -> Download -> UVR -> ASR -> Cleanup.
 """
 import os
 import asyncio
+import functools
+import itertools
 from typing import Callable, Awaitable, Optional
 from starlette.concurrency import run_in_threadpool
 
 from app.asr.client import asr_client
-from app.db import update_transcription_text, update_task_status, update_transcription_asr_model, update_transcription_is_subtitle
+from app.db import update_task_status, update_transcription_fields, update_ai_status, get_video_meta, get_transcription
+from app.db.prompts import increment_prompt_use_count
 from app.core.task_manager import task_manager, TaskCancelledException
 from app.utils.process_utils import run_cancellable_process
-from app.utils.preprocessing import separate_vocals
+from app.utils.preprocessing import separate_vocals, strip_subtitle_metadata, SPECIAL_TOKEN_RE
 from app.core.logger import logger
+from app.core.config import settings
 from app.services.media_cache import MediaCacheService
+from app.db.connection import CWD_PREFIX
 from app.utils.progress import ProgressHelper
-import re
 import time
 
+# Bounds concurrent auto-analysis LLM calls so a burst of finished tasks
+# doesn't fire them all at once (rate limits, memory)
+_auto_analysis_sem = asyncio.Semaphore(max(1, settings.MAX_CONCURRENT_AUTO_ANALYSES))
+_auto_analysis_waiting = 0
+
+# Auto-analysis task IDs: a per-process counter can't collide the way two
+# completions in the same millisecond of time.time() can
+_auto_task_ids = itertools.count(time.monotonic_ns() & 0xFFFFFFFF)
+
+
 async def run_transcription_pipeline(
     transcription_id: int,
     downloader: Callable[[int], Awaitable[str]],
@@ -58,20 +72,19 @@ async def run_transcription_pipeline(
         # 0. Start Task
         # Note: metadata is usually set by caller before calling pipeline, but we can update status
         logger.info(f"👷 Starting {source_label} pipeline for ID: {transcription_id}")
-        update_task_status(transcription_id, "processing")
+        await run_in_threadpool(update_task_status, transcription_id, "processing")
         task_manager.start_task(transcription_id, meta={"title": f"[{source_label}] Transcription", "source": source_key})
         
         # 1. Check Cache
-        # MediaCacheService uses relative paths
+        # Relative path; find_existing_cache re-checks the file on every hit, so it
+        # existed just now (it can still be removed before the pipeline opens it)
         cached_rel_path, cached_quality = MediaCacheService.find_existing_cache(source_key, mode='transcription', return_quality=True)
         if cached_rel_path:
-            full_path = os.path.join(os.getcwd(), cached_rel_path)
-            if os.path.exists(full_path):
-                logger.info(f"♻️ Found existing cached media for {source_key}: {cached_rel_path} (quality: {cached_quality})")
-                audio_path = full_path
-                using_cache = True
-                MediaCacheService.assign_cache(transcription_id, cached_rel_path, cached_quality)
-                task_manager.update_progress(transcription_id, 30, f"Using cached media ({cached_quality})...")
+            logger.info(f"♻️ Found existing cached media for {source_key}: {cached_rel_path} (quality: {cached_quality})")
+            audio_path = CWD_PREFIX + cached_rel_path
+            using_cache = True
+            MediaCacheService.assign_cache(transcription_id, cached_rel_path, cached_quality)
+            task_manager.update_progress(transcription_id, 30, f"Using cached media ({cached_quality})...")
 
         # 1.5 Pre-ASR Hook (e.g. YouTube Subtitles)
         if not using_cache and pre_asr_hook:
@@ -85,13 +98,11 @@ async def run_transcription_pipeline(
                 skipped_result = await pre_asr_hook(transcription_id)
                 if skipped_result:
                     logger.info("✨ Pre-ASR hook returned result. Skipping pipeline.")
-                    update_transcription_text(transcription_id, skipped_result)
-                    
-                    # Update model to "Subtitle" so frontend badge shows correctly
-                    update_transcription_asr_model(transcription_id, "Subtitle")
-                    update_transcription_is_subtitle(transcription_id, True)
-                    
-                    update_task_status(transcription_id, "completed")
+                    # Model "Subtitle" so frontend badge shows correctly
+                    await _commit_result(
+                        transcription_id, "completed", skipped_result,
+                        asr_model="Subtitle", is_subtitle=True
+                    )
                     task_manager.finish_task(transcription_id)
                     # Also trigger AI analysis if requested
                     if auto_analyze_prompt:
@@ -137,7 +148,7 @@ async def run_transcription_pipeline(
                         # If we delete `audio_path` now, we can't cache it.
                         # Logic from transcription.py:
                         # "if not using_cache: remove(audio_path)"
-                        if audio_path and os.path.exists(audio_path):
+                        if audio_path:
                             os.remove(audio_path)
                     except OSError:
                         pass
@@ -153,20 +164,14 @@ async def run_transcription_pipeline(
         val = 50 if use_uvr else 30
         
         # 4. ASR — Check worker queue status for better progress message
+        # Cached health data only; transcribe() does the real worker selection
         asr_msg = "Transcribing..."
-        try:
-            engine_key = asr_client.select_worker()
-            queue_info = asr_client.shared_paths  # We have health data cached
-            # Check concurrency info from last health check
-            health_data = getattr(asr_client, '_last_health', {}).get(engine_key, {})
-            queue_depth = health_data.get('concurrency', {}).get('queue', 0)
-            if queue_depth > 0:
-                asr_msg = f"Queued ({queue_depth} ahead)..."
-                logger.info(f"⏳ ASR worker [{engine_key}] has {queue_depth} queued tasks")
-            else:
-                asr_msg = f"Transcribing ({engine_key})..."
-        except Exception:
-            pass
+        engine_key, queue_depth = asr_client.peek_worker_status()
+        if queue_depth > 0:
+            asr_msg = f"Queued ({queue_depth} ahead)..."
+            logger.info(f"⏳ ASR worker [{engine_key}] has {queue_depth} queued tasks")
+        elif engine_key:
+            asr_msg = f"Transcribing ({engine_key})..."
         task_manager.update_progress(transcription_id, val, asr_msg)
         
         final_format = output_format
@@ -183,8 +188,7 @@ async def run_transcription_pipeline(
         
         # 5. Finalize
         task_manager.update_progress(transcription_id, 95, "Finalizing...")
-        update_transcription_text(transcription_id, raw_text)
-        update_task_status(transcription_id, "completed")
+        await _commit_result(transcription_id, "completed", raw_text)
         logger.info(f"✅ {source_label} task completed for ID: {transcription_id}")
         
         # 5.5 Auto-Analyze Trigger
@@ -198,29 +202,39 @@ async def run_transcription_pipeline(
 
     except TaskCancelledException as e:
         logger.warning(f"🛑 {source_label} Task {transcription_id} Cancelled")
-        update_task_status(transcription_id, "cancelled")
-        update_transcription_text(transcription_id, "Task Cancelled")
+        await _commit_result(transcription_id, "cancelled", "Task Cancelled")
         task_manager.finish_task(transcription_id)
         
     except Exception as e:
         logger.error(f"❌ {source_label} background task failed for ID {transcription_id}: {e}")
-        update_task_status(transcription_id, "failed")
-        update_transcription_text(transcription_id, f"Error: {str(e)}")
+        await _commit_result(transcription_id, "failed", f"Error: {str(e)}")
         task_manager.finish_task(transcription_id)
         
     finally:
         # 6. Cleanup
+        # File I/O runs in the threadpool: unlink/rename can stall on network storage
         if is_temp_derived:
             # Always delete derived temp files (UVR output)
-            if audio_path and os.path.exists(audio_path):
+            if audio_path:
                 try:
-                    os.remove(audio_path)
+                    await run_in_threadpool(os.remove, audio_path)
                     logger.debug(f"🗑️ Deleted temp UVR file: {audio_path}")
-                except Exception as e:
+                except OSError:
                     pass
         elif not using_cache:
             # If we downloaded a fresh file, cache it or delete it based on policy
-            MediaCacheService.cleanup_or_delete(audio_path, transcription_id, source=source_key, quality='audio_only')
+            await run_in_threadpool(
+                MediaCacheService.cleanup_or_delete,
+                audio_path, transcription_id, source=source_key, quality='audio_only'
+            )
+
+
+async def _commit_result(transcription_id, status, text, asr_model=None, is_subtitle=None):
+    """Persist a phase transition's text/model/flag/status as one UPDATE, off the event loop."""
+    await run_in_threadpool(
+        update_transcription_fields, transcription_id,
+        text=text, asr_model=asr_model, is_subtitle=is_subtitle, status=status
+    )
 
 
 async def _run_asr_with_cancel(transcription_id, audio_path, language, prompt, output_format):
@@ -234,32 +248,35 @@ async def _run_asr_with_cancel(transcription_id, audio_path, language, prompt, o
     )
 
     transcribe_task = asyncio.create_task(asr_coro)
-    monitor_task = asyncio.create_task(task_manager.wait_for_cancel(transcription_id))
-    
-    done, pending = await asyncio.wait([transcribe_task, monitor_task], return_when=asyncio.FIRST_COMPLETED)
-    
-    if monitor_task in done:
-        # Check if actually cancelled
-        if task_manager.is_cancelled(transcription_id):
-            transcribe_task.cancel()
-            try:
-                await transcribe_task
-            except asyncio.CancelledError:
-                pass
-            raise TaskCancelledException("Task cancelled by user during transcription")
+    # Cancellation is a signal: wake on the task's cancel event instead of polling
+    cancel_wait = asyncio.ensure_future(task_manager.get_cancel_event(transcription_id).wait())
+    try:
+        await asyncio.wait({transcribe_task, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        cancel_wait.cancel()
     
-    # Check monitor task just in case it finished but wasn't cancelled (unlikely)
-    monitor_task.cancel()
+    if not transcribe_task.done():
+        transcribe_task.cancel()
+        try:
+            await transcribe_task
+        except asyncio.CancelledError:
+            pass
+        raise TaskCancelledException("Task cancelled by user during transcription")
     
     if transcribe_task.cancelled():
         raise TaskCancelledException("Task cancelled")
-        
-    try:
-        return transcribe_task.result()
-    except asyncio.CancelledError:
-        raise TaskCancelledException("Task cancelled")
-    except Exception as e:
-        raise e
+    
+    return transcribe_task.result()
+
+
+@functools.cache
+def _process_ai_analysis():
+    """
+    Resolve the AI analysis runner once. It lives in the endpoint layer, so it
+    is imported on first use to keep the service -> API import one-way at load.
+    """
+    from app.api.v1.endpoints.ai import process_ai_analysis
+    return process_ai_analysis
 
 
 async def _trigger_auto_analysis(
@@ -271,12 +288,10 @@ async def _trigger_auto_analysis(
     source_label: str,
 ):
     """Shared helper to trigger AI analysis after transcription completion."""
-    from app.api.v1.endpoints.ai import process_ai_analysis
-    from app.db.prompts import increment_prompt_use_count
-    from app.db import update_ai_status, get_video_meta
+    process_ai_analysis = _process_ai_analysis()
 
-    # Generate task ID (same convention as normal /api/analyze endpoint)
-    task_id = -int(time.time() * 1000) % 1000000000
+    # Generate task ID (same range as the /api/analyze endpoint's IDs)
+    task_id = -next(_auto_task_ids) % 1000000000
 
     logger.info(f"🤖 Triggering auto-analysis for ID: {transcription_id} (prompt_id={auto_analyze_prompt_id})")
 
@@ -287,13 +302,12 @@ async def _trigger_auto_analysis(
     # Preprocess text: strip subtitle metadata if requested
     text_to_analyze = raw_text
     if strip_subtitle:
-        from app.utils.preprocessing import strip_subtitle_metadata
-        text_to_analyze = strip_subtitle_metadata(raw_text)
+        # Long transcripts take a while to scan; keep it off the event loop
+        text_to_analyze = await run_in_threadpool(strip_subtitle_metadata, raw_text)
     else:
-        text_to_analyze = re.sub(r'<\|.*?\|>', '', raw_text)
+        text_to_analyze = SPECIAL_TOKEN_RE.sub('', raw_text)
 
     # Retrieve title for task center display
-    from app.db.transcriptions import get_transcription
     record = get_transcription(transcription_id)
     title = source_label
     if record:
@@ -313,17 +327,39 @@ async def _trigger_auto_analysis(
     # Tag prompt if preprocessing was applied
     stored_prompt = f"[Preprocessed] {auto_analyze_prompt}" if strip_subtitle else auto_analyze_prompt
 
-    # Launch async analysis
+    # Launch async analysis (waits for a free slot if too many are running)
     asyncio.create_task(
-        process_ai_analysis(
-            item_id=transcription_id,
-            task_id=task_id,
-            text_to_analyze=text_to_analyze,
-            prompt=stored_prompt,
-            llm_model_id=None,
-            parent_id=None,
-            input_text=None,
-            overwrite=False,
-            overwrite_id=None,
+        _run_bounded_analysis(
+            process_ai_analysis(
+                item_id=transcription_id,
+                task_id=task_id,
+                text_to_analyze=text_to_analyze,
+                prompt=stored_prompt,
+                llm_model_id=None,
+                parent_id=None,
+                input_text=None,
+                overwrite=False,
+                overwrite_id=None,
+            )
         )
     )
+
+
+async def _run_bounded_analysis(analysis):
+    """Run an auto-analysis coroutine once a concurrency slot is free."""
+    global _auto_analysis_waiting
+    _auto_analysis_waiting += 1
+    try:
+        if _auto_analysis_sem.locked():
+            logger.info(f"⏳ Auto-analysis queued ({_auto_analysis_waiting} waiting)")
+        await _auto_analysis_sem.acquire()
+    except BaseException:
+        analysis.close()
+        raise
+    finally:
+        _auto_analysis_waiting -= 1
+    
+    try:
+        await analysis
+    finally:
+        _auto_analysis_sem.release()
@@ -3,15 +3,23 @@ Video Service Layer
 Business logic extracted from the videos endpoint for reuse and testability.
 """
 import re
+import asyncio
+import operator
+from itertools import chain
 from datetime import datetime, timedelta
+from starlette.concurrency import run_in_threadpool
 
 from app.db import (
     get_transcription_by_source,
     batch_count_ai_summaries, batch_get_cache_counts, batch_get_video_tags,
-    delete_video_meta, delete_transcriptions_by_source,
+    delete_video_meta, delete_transcriptions_by_source, resolve_source_id,
 )
 from app.services.media_cache import MediaCacheService
 from app.utils.source_utils import normalize_source_id
+from app.utils.preprocessing import SPECIAL_TOKEN_RE
+
+_BV_RE = re.compile(r"BV\w+")
+_DOUYIN_VID_RE = re.compile(r"(\d{15,})")
 
 
 def resolve_effective_source(source_id: str) -> str:
@@ -20,29 +28,8 @@ def resolve_effective_source(source_id: str) -> str:
     Handles normalized IDs, legacy un-normalized records, and transcription-only records.
     Returns the effective source_id string to use for DB operations.
     """
-    from app.db.video_meta import get_video_meta as _get_video_meta
-
     normalized_id = normalize_source_id(source_id)
-    meta_record = _get_video_meta(normalized_id)
-
-    if meta_record:
-        return normalized_id
-
-    # Fallback: legacy un-normalized record
-    meta_record = _get_video_meta(source_id)
-    if meta_record:
-        return source_id
-
-    # Fallback: transcription-only record
-    local_record = get_transcription_by_source(normalized_id)
-    if local_record:
-        return local_record['source']
-
-    local_record_raw = get_transcription_by_source(source_id)
-    if local_record_raw:
-        return local_record_raw['source']
-
-    return normalized_id
+    return resolve_source_id(normalized_id, source_id)
 
 
 def delete_single_video(source_id: str) -> tuple[bool, int]:
@@ -64,14 +51,14 @@ def compute_embed_url(source_id: str, source_type: str) -> str | None:
     if source_type == 'bilibili':
         bvid = source_id if source_id.startswith('BV') else None
         if not bvid:
-            match = re.search(r"BV\w+", source_id)
+            match = _BV_RE.search(source_id)
             bvid = match.group(0) if match else None
         if bvid:
             return f"//player.bilibili.com/player.html?bvid={bvid}&autoplay=0"
     elif source_type == 'youtube':
         return f"https://www.youtube.com/embed/{source_id}"
     elif source_type == 'douyin':
-        vid_match = re.search(r"(\d{15,})", source_id)
+        vid_match = _DOUYIN_VID_RE.search(source_id)
         if vid_match:
             return f"https://open.douyin.com/player/video?vid={vid_match.group(1)}&autoplay=0"
     return None
@@ -92,12 +79,10 @@ def compute_effective_expiry(meta_dict: dict, cache_versions: list[dict]) -> str
     # Global policy
     global_policy, days = MediaCacheService.get_retention_policy()
 
-    # Find latest cached_at across all versions
-    latest_cached_at = None
-    if cache_versions:
-        cached_at_values = [v.get('cached_at', '') for v in cache_versions if v.get('cached_at')]
-        if cached_at_values:
-            latest_cached_at = max(cached_at_values)
+    # Find latest cached_at across all versions (one pass, no intermediate list)
+    latest_cached_at = max(
+        (v['cached_at'] for v in cache_versions if v.get('cached_at')), default=None
+    )
 
     if global_policy == 'keep_days' and days > 0 and latest_cached_at:
         try:
@@ -120,65 +105,74 @@ def compute_effective_expiry(meta_dict: dict, cache_versions: list[dict]) -> str
 
 def build_video_list_row(r, format_cover) -> dict:
     """Convert a raw DB row tuple from the video list query into a dict."""
-    cid = r[0]
-    original_source = r[1]
-    row_type = r[2] or 'bilibili'
-    title = r[3] or cid
-    cover = r[4]
-    created_at = r[5]
-    updated_at = r[6]
-    is_archived = r[7] or 0
-
-    count = r[8]
-    row_ids_str = r[9]
-    latest_status = r[10] if r[10] else 'completed'
-    latest_timestamp = r[11]
-    latest_asr_model = r[12]
-    subtitle_flag = r[13]
-    is_analyzing = bool(r[14])
-
-    r_ids = [int(x) for x in row_ids_str.split(',')] if row_ids_str else []
+    (cid, original_source, row_type, title, cover, created_at, updated_at, is_archived,
+     count, row_ids_str, latest_status, latest_timestamp, latest_asr_model,
+     subtitle_flag, is_analyzing) = r[:15]
+
+    title = title or cid
+    last_updated = latest_timestamp or updated_at or created_at
+    r_ids = list(map(int, row_ids_str.split(','))) if row_ids_str else []
 
     return {
         "bvid": cid,
         "source_id": cid,
         "source": original_source or cid,
-        "source_type": row_type,
+        "source_type": row_type or 'bilibili',
         "title": title,
+        # Lowered once for both the title search and the title sort
+        "_title_lc": title.lower(),
         "cover": format_cover(cover),
-        "last_updated": latest_timestamp or updated_at or created_at,
-        "last_updated_ts": latest_timestamp or updated_at or created_at,
-        "latest_status": latest_status,
+        "last_updated": last_updated,
+        "last_updated_ts": last_updated,
+        "latest_status": latest_status or 'completed',
         "asr_model": latest_asr_model,
         "is_subtitle": subtitle_flag,
         "count": count,
         "ai_count": 0,
-        "is_analyzing_ai": is_analyzing,
+        "is_analyzing_ai": bool(is_analyzing),
         "id": r_ids[0] if r_ids else None,
         "_row_ids": r_ids,
-        "is_archived": is_archived,
+        "is_archived": is_archived or 0,
         "media_available": False,
         "cache_count": 0,
     }
 
 
-def enrich_video_list(videos: list[dict], all_source_ids: list[str], all_row_ids: list[int]):
-    """Batch-enrich video list with AI counts, cache counts, and tags (in-place)."""
+async def enrich_video_list(videos: list[dict], all_source_ids: list[str], all_row_ids: list[int]):
+    """
+    Batch-enrich video list with AI counts, cache counts, and tags (in-place).
+    The id lists come from the video list query and are already distinct:
+    source_id is video_meta's key and each transcription row has one source.
+    """
+    if not videos:
+        return
+
+    # The three batch queries are independent (each opens its own connection)
+    ai_counts, cache_counts, video_tags_map = await asyncio.gather(
+        run_in_threadpool(batch_count_ai_summaries, all_row_ids),
+        run_in_threadpool(batch_get_cache_counts, all_source_ids),
+        run_in_threadpool(batch_get_video_tags, all_source_ids),
+    )
+
     # AI summary counts
-    ai_counts = batch_count_ai_summaries(all_row_ids) if all_row_ids else {}
+    get_ai_count = ai_counts.get
     for v in videos:
-        v['ai_count'] = sum(ai_counts.get(rid, 0) for rid in v['_row_ids'])
-        v.pop('_row_ids', None)
+        rids = v.pop('_row_ids', None)
+        if not rids:
+            v['ai_count'] = 0
+        elif len(rids) == 1:
+            # Most videos have a single transcription row
+            v['ai_count'] = get_ai_count(rids[0], 0)
+        else:
+            v['ai_count'] = sum(get_ai_count(rid, 0) for rid in rids)
 
     # Cache entry counts
-    cache_counts = batch_get_cache_counts(all_source_ids) if all_source_ids else {}
     for v in videos:
         ca_count = cache_counts.get(v['source_id'], 0)
         v['media_available'] = ca_count > 0
         v['cache_count'] = ca_count
 
     # Tags
-    video_tags_map = batch_get_video_tags(all_source_ids)
     for v in videos:
         v['tags'] = video_tags_map.get(v['source_id'], [])
 
@@ -194,57 +188,57 @@ def apply_filters(
     include_archived: str = None,
     search: str = None,
 ) -> list[dict]:
-    """Apply all filter criteria to the video list."""
-    result = video_list
-
-    if status:
-        if status == 'empty':
-            result = [v for v in result if v['count'] == 0]
-        elif status == 'no_content':
-            result = [v for v in result if v['count'] == 0 and v['cache_count'] == 0]
-        elif status == 'cached_only':
-            result = [v for v in result if v['count'] == 0 and v['cache_count'] > 0]
-        elif status == 'completed':
-            result = [v for v in result if v.get('latest_status') == 'completed']
-        else:
-            result = [v for v in result if v.get('latest_status') == status]
-
-    if has_segments is not None:
-        result = [v for v in result if (v['count'] > 0) == has_segments]
-    if has_ai is not None:
-        result = [v for v in result if (v['ai_count'] > 0) == has_ai]
-    if has_cached is not None:
-        result = [v for v in result if bool(v['media_available']) == has_cached]
-    if is_subtitle is not None:
-        result = [v for v in result if bool(v.get('is_subtitle')) == is_subtitle]
-
-    # Archive filter
-    if include_archived == '1':
-        result = [v for v in result if v.get('is_archived') == 1]
-    elif include_archived == 'all':
-        pass
-    else:
-        result = [v for v in result if not v.get('is_archived')]
-
-    # Title search
-    if search and search.strip():
-        q = search.strip().lower()
-        result = [v for v in result if q in (v.get('title') or '').lower()]
-
-    return result
+    """Apply all filter criteria to the video list in a single pass."""
+    q = search.strip().lower() if search and search.strip() else None
+
+    def _match(v: dict) -> bool:
+        count = v['count']
+        if status:
+            if status == 'empty':
+                if count != 0:
+                    return False
+            elif status == 'no_content':
+                if count != 0 or v['cache_count'] != 0:
+                    return False
+            elif status == 'cached_only':
+                if count != 0 or v['cache_count'] <= 0:
+                    return False
+            elif v.get('latest_status') != status:
+                return False
+
+        if has_segments is not None and (count > 0) != has_segments:
+            return False
+        if has_ai is not None and (v['ai_count'] > 0) != has_ai:
+            return False
+        if has_cached is not None and bool(v['media_available']) != has_cached:
+            return False
+        if is_subtitle is not None and bool(v.get('is_subtitle')) != is_subtitle:
+            return False
+
+        # Archive filter
+        if include_archived == '1':
+            if v.get('is_archived') != 1:
+                return False
+        elif include_archived != 'all' and v.get('is_archived'):
+            return False
+
+        # Title search
+        return q is None or q in v['_title_lc']
+
+    return [v for v in video_list if _match(v)]
 
 
 def apply_sorting(video_list: list[dict], sort_by: str = 'time'):
-    """Sort the video list in-place."""
+    """Sort the video list (rows from build_video_list_row) in-place."""
     if sort_by == 'title':
-        video_list.sort(key=lambda x: (x.get('title') or x.get('source_id') or '').lower())
+        video_list.sort(key=operator.itemgetter('_title_lc'))
     elif sort_by == 'segments':
         video_list.sort(key=lambda x: x['count'], reverse=True)
     else:  # 'time' (default)
         video_list.sort(key=lambda x: x.get('last_updated') or '', reverse=True)
 
 
-def build_paginated_video_list(
+async def build_paginated_video_list(
     *,
     format_cover,
     page: int = 1,
@@ -264,50 +258,91 @@ def build_paginated_video_list(
     """
     Build a paginated, filtered, sorted video list.
     Orchestrates: DAO query → row building → enrichment → filtering → sorting → pagination.
+    Column filters run in SQL. Without enrichment-dependent filters or the title
+    sort, SQL also sorts and pages, so only the page's rows are built and enriched.
     """
-    from app.db.video_meta import query_video_list_with_stats
-
-    rows = query_video_list_with_stats(
-        source_type=source_type, tag_id=tag_id, exclude_tag_id=exclude_tag_id
+    from app.db.video_meta import (
+        query_video_list_with_stats, query_video_page_with_stats,
     )
 
-    all_source_ids = []
-    all_row_ids = []
-    videos = []
-
-    for r in rows:
-        v_dict = build_video_list_row(r, format_cover)
-        all_row_ids.extend(v_dict['_row_ids'])
-        all_source_ids.append(v_dict['source_id'])
-        videos.append(v_dict)
-
-    enrich_video_list(videos, all_source_ids, all_row_ids)
-
-    video_list = apply_filters(
-        videos,
+    sql_filters = dict(
+        source_type=source_type,
+        tag_id=tag_id,
+        exclude_tag_id=exclude_tag_id,
         status=status,
         has_segments=has_segments,
-        has_ai=has_ai,
-        has_cached=has_cached,
         is_subtitle=is_subtitle,
         include_archived=include_archived,
-        search=search,
+    )
+    sql_sort = 'segments' if sort_by == 'segments' else ('time' if sort_by != 'title' else None)
+    needs_enrichment_filter = (
+        status in ('no_content', 'cached_only')
+        or has_ai is not None
+        or has_cached is not None
+        or bool(search and search.strip())
     )
 
-    apply_sorting(video_list, sort_by)
+    if sql_sort and not needs_enrichment_filter and page >= 1 and limit >= 1:
+        rows, total = await run_in_threadpool(
+            query_video_page_with_stats,
+            sort_by=sql_sort, limit=limit, offset=(page - 1) * limit, **sql_filters
+        )
+        items = await _build_enriched_rows(rows, format_cover)
+    else:
+        rows = await run_in_threadpool(query_video_list_with_stats, **sql_filters)
+        videos = await _build_enriched_rows(rows, format_cover)
+
+        # Column filters already ran in SQL; re-checking them is a no-op
+        video_list = await run_in_threadpool(
+            _filter_and_sort, videos,
+            sort_by=sort_by, status=status, has_ai=has_ai, has_cached=has_cached, search=search,
+        )
 
-    total = len(video_list)
-    start = (page - 1) * limit
-    end = start + limit
+        total = len(video_list)
+        start = (page - 1) * limit
+        end = start + limit
+        items = video_list[start:end]
+
+    for v in items:
+        v.pop('_title_lc', None)
 
     return {
         "total": total,
         "page": page,
         "limit": limit,
-        "items": video_list[start:end],
+        "items": items,
     }
 
 
+def _build_rows(rows, format_cover):
+    """build_video_list_row over the rows; also returns their source and row ids."""
+    videos = [build_video_list_row(r, format_cover) for r in rows]
+    all_source_ids = [v['source_id'] for v in videos]
+    all_row_ids = list(chain.from_iterable(v['_row_ids'] for v in videos))
+    return videos, all_source_ids, all_row_ids
+
+
+async def _build_enriched_rows(rows, format_cover) -> list[dict]:
+    """Build the row dicts in the threadpool, then batch-enrich them."""
+    videos, all_source_ids, all_row_ids = await run_in_threadpool(_build_rows, rows, format_cover)
+    await enrich_video_list(videos, all_source_ids, all_row_ids)
+    return videos
+
+
+def _filter_and_sort(videos, *, sort_by, status, has_ai, has_cached, search) -> list[dict]:
+    """Enrichment-dependent filters plus in-memory sort for the full-list path."""
+    video_list = apply_filters(
+        videos,
+        status=status,
+        has_ai=has_ai,
+        has_cached=has_cached,
+        include_archived='all',
+        search=search,
+    )
+    apply_sorting(video_list, sort_by)
+    return video_list
+
+
 def build_video_detail(source_id: str, format_cover) -> dict | None:
     """
     Build full detail dict for a specific video.
@@ -325,6 +360,7 @@ def build_video_detail(source_id: str, format_cover) -> dict | None:
     row_data = get_transcription_by_source(source_id)
 
     row = {}
+    meta = None
     if row_data:
         row = dict(row_data)
     else:
@@ -355,7 +391,7 @@ def build_video_detail(source_id: str, format_cover) -> dict | None:
             'timestamp': meta['updated_at'] or meta['created_at'],
             'stream_url': meta['stream_url'],
             'stream_expired': meta['stream_expired'],
-            'is_archived': dict(meta).get('is_archived', 0),
+            'is_archived': meta['is_archived'],
         }
 
     summaries = get_ai_summaries(row['id'])
@@ -366,13 +402,19 @@ def build_video_detail(source_id: str, format_cover) -> dict | None:
     cache_entries = get_cache_entries(row['source'])
     cache_versions = [dict(e) for e in cache_entries]
 
-    meta = get_video_meta(source_id)
-    meta_dict = dict(meta) if meta else {}
+    if meta is None:
+        meta = get_video_meta(source_id)
+    # Read the few fields straight off the Row instead of copying it to a dict
+    if meta:
+        is_archived, notes = meta['is_archived'], meta['notes']
+        policy = {'cache_policy': meta['cache_policy'], 'cache_expires_at': meta['cache_expires_at']}
+    else:
+        is_archived, notes, policy = 0, None, {}
 
     embed_url = compute_embed_url(
         source_id, row.get('source_type', 'bilibili')
     )
-    effective_expires_at = compute_effective_expiry(meta_dict, cache_versions)
+    effective_expires_at = compute_effective_expiry(policy, cache_versions)
 
     return {
         "id": row['id'],
@@ -382,7 +424,7 @@ def build_video_detail(source_id: str, format_cover) -> dict | None:
         "title": row.get('video_title'),
         "cover": format_cover(row.get('video_cover')),
         "raw_text": row['raw_text'],
-        "text": re.sub(r'<\|.*?\|>', '', row['raw_text']),
+        "text": SPECIAL_TOKEN_RE.sub('', row['raw_text']),
         "ai_summary": row['ai_summary'],
         "ai_status": row.get('ai_status'),
         "latest_status": row.get('status', 'completed'),
@@ -396,14 +438,14 @@ def build_video_detail(source_id: str, format_cover) -> dict | None:
         "timestamp": row['timestamp'],
         "stream_url": row.get('stream_url'),
         "stream_expired": bool(row.get('stream_expired', False)),
-        "is_archived": meta_dict.get('is_archived', 0),
+        "is_archived": is_archived,
         "media_path": media_path,
         "media_available": media_available,
         "cache_versions": cache_versions,
-        "cache_expires_at": meta_dict.get('cache_expires_at'),
-        "cache_policy": meta_dict.get('cache_policy'),
+        "cache_expires_at": policy.get('cache_expires_at'),
+        "cache_policy": policy.get('cache_policy'),
         "effective_expires_at": effective_expires_at,
-        "notes": meta_dict.get('notes'),
+        "notes": notes,
         "embed_url": embed_url,
         "tags": get_tags_for_video(row['source']),
     }
@@ -415,7 +457,6 @@ async def refresh_metadata(source_id: str, format_cover, download_cover_fn) -> d
     Returns dict with status, title, cover, source_type.
     Raises ValueError on unsupported platforms or failure.
     """
-    from starlette.concurrency import run_in_threadpool
     from app.db import update_video_metadata, get_system_config
     from app.db.video_meta import get_video_meta as _get_video_meta
     from app.downloaders.bilibili import get_video_info
@@ -426,18 +467,12 @@ async def refresh_metadata(source_id: str, format_cover, download_cover_fn) -> d
 
     local_record = get_transcription_by_source(source_id)
     source_type = 'bilibili'
-    actual_source = source_id
 
     if local_record:
-        rec_dict = dict(local_record)
-        source_type = rec_dict.get('source_type') or 'bilibili'
-        actual_source = rec_dict.get('original_source') or rec_dict.get('source') or source_id
-    else:
-        meta = _get_video_meta(source_id)
-        if meta:
-            meta_dict = dict(meta)
-            actual_source = meta_dict.get('original_source') or source_id
-            source_type = infer_source_type(source_id)
+        if 'source_type' in local_record.keys():
+            source_type = local_record['source_type'] or 'bilibili'
+    elif _get_video_meta(source_id):
+        source_type = infer_source_type(source_id)
 
     if source_type == 'douyin':
         raise ValueError("抖音不支持服务器端同步 (请使用浏览器插件)")
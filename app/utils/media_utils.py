@@ -2,22 +2,39 @@
 Media utility functions.
 Extracted from transcribe endpoint for reusability.
 """
+import os
+import re
+import asyncio
 import subprocess
 import mimetypes
+from starlette.concurrency import run_in_threadpool
 from app.core.logger import logger
 
+# Direct media links: a known extension at the end or before the query string,
+# or a Douyin CDN pattern. Case-insensitive, so the URL is not lowercased.
+_MEDIA_URL_RE = re.compile(
+    r'\.(?:mp4|mp3|wav|m4a|webm|ogg|flac|aac)(?:\?|\Z)'
+    r'|douyin\.com/aweme/v1/play'
+    r'|bytecdn\.cn',
+    re.IGNORECASE,
+)
+
+
+def _frame_cmd(video_path: str, output_path: str) -> list:
+    return [
+        'ffmpeg', '-y',
+        '-ss', '0.5',
+        '-i', video_path,
+        '-vframes', '1',
+        '-q:v', '2',
+        output_path
+    ]
+
 
 def extract_video_frame(video_path: str, output_path: str) -> bool:
     """Extract the first frame from a video using FFmpeg."""
     try:
-        cmd = [
-            'ffmpeg', '-y',
-            '-ss', '0.5',
-            '-i', video_path,
-            '-vframes', '1',
-            '-q:v', '2',
-            output_path
-        ]
+        cmd = _frame_cmd(video_path, output_path)
         result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='ignore')
         if result.returncode != 0:
             logger.error(f"FFmpeg Error: {result.stderr}")
@@ -28,23 +45,55 @@ def extract_video_frame(video_path: str, output_path: str) -> bool:
         return False
 
 
+async def extract_video_frame_async(video_path: str, output_path: str) -> bool:
+    """
+    extract_video_frame for async callers: FFmpeg runs as an asyncio
+    subprocess, so neither the event loop nor a pool thread waits on it.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_frame_cmd(video_path, output_path),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except NotImplementedError:
+        # Event loop without subprocess support (e.g. Windows selector loop)
+        return await run_in_threadpool(extract_video_frame, video_path, output_path)
+    except Exception as e:
+        logger.error(f"FFmpeg Exception: {e}")
+        return False
+
+    try:
+        _, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    if proc.returncode != 0:
+        logger.error(f"FFmpeg Error: {stderr.decode('utf-8', errors='ignore')}")
+        return False
+    return True
+
+
 def is_network_media_url(url: str) -> bool:
     """Check if URL is a direct media link."""
-    url_lower = url.lower()
-    # Common media extensions
-    media_extensions = ['.mp4', '.mp3', '.wav', '.m4a', '.webm', '.ogg', '.flac', '.aac']
-    if any(url_lower.endswith(ext) or f"{ext}?" in url_lower for ext in media_extensions):
-        return True
-    # Douyin CDN patterns
-    if "douyin.com/aweme/v1/play" in url_lower or "bytecdn.cn" in url_lower:
-        return True
-    return False
+    return _MEDIA_URL_RE.search(url) is not None
+
+
+# Extensions this app sees most; anything else goes through mimetypes
+_MEDIA_TYPE_BY_EXT = {
+    ".mp4": "video", ".webm": "video", ".mov": "video", ".mkv": "video",
+    ".mp3": "audio", ".m4a": "audio", ".wav": "audio", ".flac": "audio",
+    ".aac": "audio", ".ogg": "audio",
+}
 
 
 def detect_media_type(filename: str, content_type: str = None) -> str:
     """Detect media type from filename/content_type. Returns 'video', 'audio', or 'file'."""
     mime = content_type or ""
     if not mime or mime == "application/octet-stream":
+        media_type = _MEDIA_TYPE_BY_EXT.get(os.path.splitext(filename or "")[1].lower())
+        if media_type:
+            return media_type
         mime, _ = mimetypes.guess_type(filename)
         mime = mime or ""
     
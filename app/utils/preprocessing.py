@@ -1,14 +1,23 @@
 import os
+import re
 import logging
+import functools
 from app.core.logger import logger
 
-# Optional Dependency for UVR5
-try:
-    from audio_separator.separator import Separator
-    HAS_UVR = True
-except ImportError:
-    HAS_UVR = False
-    logger.warning("⚠️ 'audio-separator' not installed. UVR5 Vocal Separation will be disabled.")
+
+@functools.lru_cache(maxsize=1)
+def _load_separator():
+    """
+    Optional Dependency for UVR5, imported on first use so modules that only
+    need the text helpers below don't pull in audio-separator (or warn) at startup.
+    Returns the Separator class, or None if not installed.
+    """
+    try:
+        from audio_separator.separator import Separator
+        return Separator
+    except ImportError:
+        logger.warning("⚠️ 'audio-separator' not installed. UVR5 Vocal Separation will be disabled.")
+        return None
 
 def separate_vocals(audio_path, output_dir=None):
     """
@@ -22,7 +31,8 @@ def separate_vocals(audio_path, output_dir=None):
     Returns:
         str: Path to the separated vocal file.
     """
-    if not HAS_UVR:
+    Separator = _load_separator()
+    if Separator is None:
         logger.warning("❌ UVR5 requested but 'audio-separator' is not installed. Returning original audio.")
         return audio_path
 
@@ -82,41 +92,43 @@ def separate_vocals(audio_path, output_dir=None):
         logger.error(f"❌ UVR5 Processing Failed: {e}")
         return audio_path
 
+# ASR special tokens (<|zh|>, <|NEUTRAL|>, <|0.00|>, ...); shared by every
+# caller that strips them from stored transcripts
+SPECIAL_TOKEN_RE = re.compile(r'<\|.*?\|>')
+
+# Subtitle metadata patterns, compiled once for strip_subtitle_metadata
+_SEQ_OR_TIMESTAMP_RE = re.compile(
+    r'\d+'                                                                  # SRT/WebVTT sequence number
+    r'|\d{2}:\d{2}:\d{2}[,\.]\d{3}\s*-->\s*\d{2}:\d{2}:\d{2}[,\.]\d{3}.*'   # SRT timestamp line
+    r'|\d{2}:\d{2}\.\d{3}\s*-->\s*\d{2}:\d{2}\.\d{3}.*'                     # WebVTT short format
+)
+# Whisper <|0.00|> and bracketed [00:01:23] / (0:01:23) inline timestamps
+_INLINE_TS_RE = re.compile(r'<\|[\d.]+\|>|[\[\(]\d{1,5}:\d{2}(?::\d{2})?\s*[\]\)]')
+
+
 def strip_subtitle_metadata(text: str) -> str:
     """
     Remove subtitle sequence numbers and timestamp lines, keeping only text.
     Handles SRT, WebVTT, Whisper raw format, and Bilibili/YouTube inline timestamps.
     """
-    import re
-    lines = text.splitlines()
     result = []
     
-    for line in lines:
+    for line in text.splitlines():
         s = line.strip()
         if not s:
             continue
             
-        # Pure number sequence line (SRT/WebVTT)
-        if re.fullmatch(r'\d+', s):
-            continue
-            
-        # SRT timestamp line: 00:00:00,000 --> 00:00:00,000
-        if re.fullmatch(r'\d{2}:\d{2}:\d{2}[,\.]\d{3}\s*-->\s*\d{2}:\d{2}:\d{2}[,\.]\d{3}.*', s):
+        # Sequence number / timestamp lines always start with a digit
+        if s[0].isdigit() and _SEQ_OR_TIMESTAMP_RE.fullmatch(s):
             continue
             
-        # WebVTT short format: 00:00.000 --> 00:00.000
-        if re.fullmatch(r'\d{2}:\d{2}\.\d{3}\s*-->\s*\d{2}:\d{2}\.\d{3}.*', s):
+        # WebVTT headers (any casing); the first char rules out most lines
+        if s[0] in 'WwNn' and s[:6].upper().startswith(('WEBVTT', 'NOTE')):
             continue
             
-        # WebVTT headers
-        if s.upper().startswith('WEBVTT') or s.upper().startswith('NOTE'):
-            continue
-            
-        # Whisper inline timestamps: <|0.00|>
-        s = re.sub(r'<\|[\d.]+\|>', '', s).strip()
-        
-        # Inline bracket timestamps: [00:01:23] or (0:01:23)
-        s = re.sub(r'[\[\(]\d{1,5}:\d{2}(:\d{2})?\s*[\]\)]', '', s).strip()
+        # Inline timestamps, both kinds in one pass
+        if '<|' in s or ':' in s:
+            s = _INLINE_TS_RE.sub('', s).strip()
         
         if s:
             result.append(s)
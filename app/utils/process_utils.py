@@ -1,5 +1,7 @@
 import multiprocessing
 import asyncio
+from queue import Empty
+from starlette.concurrency import run_in_threadpool
 from app.core.task_manager import task_manager, TaskCancelledException
 from app.core.logger import logger
 
@@ -13,6 +15,22 @@ def _worker_wrapper(func, args, kwargs, queue):
         traceback.print_exc()
         queue.put({"status": "error", "error": str(e)})
 
+def _wait_for_result(p, queue):
+    """
+    Block until the child posts its result; None if it exited without one.
+    Draining the queue before join() keeps a large result from wedging the child.
+    """
+    while True:
+        try:
+            return queue.get(True, 0.5)
+        except Empty:
+            if not p.is_alive():
+                # The child may have posted right before exiting
+                try:
+                    return queue.get_nowait()
+                except Empty:
+                    return None
+
 async def run_cancellable_process(task_id: int, func, *args, **kwargs):
     """
     Run a blocking function in a separate process to allow termination.
@@ -27,28 +45,34 @@ async def run_cancellable_process(task_id: int, func, *args, **kwargs):
     logger.info(f"🚀 Started subprocess {p.pid} for task {task_id}")
     
     try:
-        while p.is_alive():
-            if task_manager.is_cancelled(task_id):
-                logger.warning(f"🛑 Terminating process {p.pid} for task {task_id}")
-                p.terminate()
-                p.join(timeout=2)
-                if p.is_alive(): 
-                    logger.warning(f"💀 Killing process {p.pid}")
-                    p.kill()
-                raise TaskCancelledException("Process terminated by user")
-            
-            await asyncio.sleep(0.5)
+        # Wake on whichever comes first: the child's result or the task's cancel event
+        fetch = asyncio.ensure_future(run_in_threadpool(_wait_for_result, p, queue))
+        cancel_wait = asyncio.ensure_future(task_manager.wait_for_cancel(task_id))
+        try:
+            await asyncio.wait({fetch, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancel_wait.cancel()
+        
+        if not fetch.done():
+            logger.warning(f"🛑 Terminating process {p.pid} for task {task_id}")
+            p.terminate()
+            p.join(timeout=2)
+            if p.is_alive(): 
+                logger.warning(f"💀 Killing process {p.pid}")
+                p.kill()
+            # The fetch thread sees the dead child and returns on its own
+            raise TaskCancelledException("Process terminated by user")
+        res = fetch.result()
             
         # Process finished naturally
         p.join() # Ensure cleanup
         
-        if not queue.empty():
-            res = queue.get()
+        if res is not None:
             if res["status"] == "error":
                 raise Exception(res["error"])
             return res["result"]
         else:
-            # If queue is empty but process finished, likely an error or crash
+            # If no result but process finished, likely an error or crash
             exitcode = p.exitcode
             if exitcode != 0:
                  raise Exception(f"Process crashed with exit code {exitcode}")
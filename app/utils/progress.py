@@ -10,6 +10,9 @@ class ProgressHelper:
         self.start_pct = start_pct
         self.end_pct = end_pct
         self.span = end_pct - start_pct
+        # update() runs once per download chunk: fold the /100 in and bind the sink once
+        self._scale = self.span / 100.0
+        self._update_progress = task_manager.update_progress
 
     def update(self, current_task_id: int, progress: float, msg: str = None):
         """
@@ -17,12 +20,13 @@ class ProgressHelper:
         Ignores current_task_id validation if needed, or verifies it matches.
         """
         # Calculate scaled progress
-        scaled_progress = self.start_pct + (progress / 100.0 * self.span)
+        scaled_progress = self.start_pct + progress * self._scale
         
         # Ensure we don't exceed end_pct due to floating point or overshoot
-        scaled_progress = min(scaled_progress, self.end_pct)
+        if scaled_progress > self.end_pct:
+            scaled_progress = self.end_pct
         
-        self.task_manager.update_progress(self.task_id, scaled_progress, msg)
+        self._update_progress(self.task_id, scaled_progress, msg)
 
     def get_callback(self) -> Callable:
         return self.update
@@ -1,8 +1,28 @@
 
 import re
 import hashlib
+import functools
 from urllib.parse import urlparse
 
+_BV_RE = re.compile(r"(BV[a-zA-Z0-9]{10})")
+_YT_ID_RE = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+P_PARAM_RE = re.compile(r"[?&]p=(\d+)")
+# BV ID plus an optional _pN suffix directly after it (internal multi-part IDs).
+# Public: also used to parse source ids in app.services.transcription
+BV_PART_RE = re.compile(r"(BV[a-zA-Z0-9]{10})(_p\d+)?")
+_DY_VIDEO_RE = re.compile(r"/video/(\d{19})")
+_DY_ID_RE = re.compile(r"^\d{19}$")
+
+
+def _short_hash(raw_source: str) -> str:
+    """
+    8-char bucket hash for sources without a natural ID.
+    Stays MD5 on purpose: stored net_/file_/dy_ IDs were derived from it.
+    """
+    return hashlib.md5(raw_source.encode('utf-8'), usedforsecurity=False).hexdigest()[:8]
+
+
+@functools.lru_cache(maxsize=4096)
 def infer_source_type(source_id: str) -> str:
     """
     Infer the source type from a normalized source_id or raw string.
@@ -14,6 +34,7 @@ def infer_source_type(source_id: str) -> str:
         return 'unknown'
         
     s = source_id.strip()
+    slen = len(s)
     
     # Bilibili
     if s.startswith("BV") or "bilibili.com" in s or "b23.tv" in s:
@@ -34,15 +55,16 @@ def infer_source_type(source_id: str) -> str:
     # YouTube (domain, short domain, or ID format)
     if "youtube.com" in s or "youtu.be" in s:
         return 'youtube'
-    if re.match(r"^[a-zA-Z0-9_-]{11}$", s):
+    if slen == 11 and _YT_ID_RE.match(s):
         return 'youtube'
         
-    # Fallback for paths
-    if re.match(r"^[A-Z]:", s) or s.startswith("/") or "\\" in s:
+    # Fallback for paths (drive letter, POSIX root, backslash)
+    if (slen >= 2 and s[1] == ':' and 'A' <= s[0] <= 'Z') or s.startswith("/") or "\\" in s:
         return 'file'
         
     return 'network'
 
+@functools.lru_cache(maxsize=4096)
 def normalize_source_id(raw_source: str, source_type: str = 'auto') -> str:
     """
     Normalize a raw source string (URL, path, ID) into a safe, short ID.
@@ -65,20 +87,16 @@ def normalize_source_id(raw_source: str, source_type: str = 'auto') -> str:
         return raw_source
     
     # 1. Bilibili (BV ID)
-    # Check if raw_source contains a BVID pattern
-    bv_match = re.search(r"(BV[a-zA-Z0-9]{10})", raw_source)
+    # Check if raw_source contains a BVID pattern; the same scan picks up an
+    # ALREADY existing _p suffix (idempotency for internal IDs)
+    bv_match = BV_PART_RE.search(raw_source)
     if bv_match:
-        bvid = bv_match.group(1)
-        
-        # Check for ALREADY existing _p suffix (idempotency for internal IDs)
-        if f"{bvid}_p" in raw_source:
-             # Extract existing suffix
-             p_exist = re.search(r"(_p\d+)", raw_source)
-             if p_exist:
-                 return f"{bvid}{p_exist.group(1)}"
+        bvid, p_exist = bv_match.group(1, 2)
+        if p_exist:
+            return f"{bvid}{p_exist}"
 
         # Check for ?p=N parameter (from URL)
-        p_match = re.search(r"[?&]p=(\d+)", raw_source)
+        p_match = P_PARAM_RE.search(raw_source)
         if p_match:
             p_val = int(p_match.group(1))
             if p_val > 1:
@@ -95,22 +113,22 @@ def normalize_source_id(raw_source: str, source_type: str = 'auto') -> str:
              return parts
             
     # YouTube Standalone ID (11 chars)
-    if re.match(r"^[a-zA-Z0-9_-]{11}$", raw_source):
+    slen = len(raw_source)
+    if slen == 11 and _YT_ID_RE.match(raw_source):
         return raw_source
 
     # 3. Douyin (Aweme ID)
     # Try to extract numeric ID from URL path: /video/7458617091420114236
-    douyin_match = re.search(r"/video/(\d{19})", raw_source)
+    douyin_match = _DY_VIDEO_RE.search(raw_source)
     if douyin_match:
         return f"dy_{douyin_match.group(1)}"
         
     # If input is just the numeric ID (19 digits)
-    if re.match(r"^\d{19}$", raw_source):
+    if slen == 19 and _DY_ID_RE.match(raw_source):
          return f"dy_{raw_source}"
 
     # 4. Fallback Hashing for everything else
-    # Use MD5 short hash (8 chars)
-    hash_digest = hashlib.md5(raw_source.encode('utf-8')).hexdigest()[:8]
+    hash_digest = _short_hash(raw_source)
     
     # Infer type for fallback if auto
     inferred_type = source_type
@@ -151,6 +169,12 @@ def reconstruct_url(source_id: str, original_source: str = None) -> str:
     # Return the ID itself as a fallback or empty string
     return ""
 
+@functools.lru_cache(maxsize=4096)
+def _resolve_bilibili_bvid_local(url_or_bvid: str) -> str | None:
+    """BV ID found in the string itself, without following short links."""
+    bv_match = _BV_RE.search(url_or_bvid)
+    return bv_match.group(1) if bv_match else None
+
 def resolve_bilibili_bvid(url_or_bvid: str) -> str | None:
     """
     Extract BV ID from URL, b23.tv short link, or raw BV ID string.
@@ -161,18 +185,18 @@ def resolve_bilibili_bvid(url_or_bvid: str) -> str | None:
     url_or_bvid = url_or_bvid.strip()
     
     # 1. Check for BV match directly
-    bv_match = re.search(r'(BV[a-zA-Z0-9]{10})', url_or_bvid)
-    if bv_match:
-        return bv_match.group(1)
+    bvid = _resolve_bilibili_bvid_local(url_or_bvid)
+    if bvid:
+        return bvid
         
-    # 2. Check for b23.tv short link
+    # 2. Check for b23.tv short link (network, never cached)
     if "b23.tv" in url_or_bvid:
         try:
             import requests
             # Resolve short URL
             resp = requests.head(url_or_bvid, allow_redirects=True, timeout=5)
             # Check resolved URL
-            bv_match = re.search(r'(BV[a-zA-Z0-9]{10})', resp.url)
+            bv_match = _BV_RE.search(resp.url)
             if bv_match:
                 return bv_match.group(1)
         except Exception:
@@ -212,6 +236,7 @@ def resolve_douyin_url(url: str) -> str:
     return url
 
 
+@functools.lru_cache(maxsize=4096)
 def resolve_youtube_video_id(url: str) -> str | None:
     """
     Extract YouTube video ID from URL.
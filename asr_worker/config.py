@@ -5,6 +5,7 @@ Priority: Environment Variables > worker_config.yaml > Code Defaults
 """
 
 import os
+import copy
 import logging
 
 logger = logging.getLogger("ASR Worker")
@@ -61,10 +62,25 @@ def _deep_merge(base: dict, override: dict) -> dict:
     return result
 
 
+# path -> (mtime, parsed dict); reloads only re-parse a file that changed
+_YAML_CACHE = {}
+
+
 def _load_yaml(path: str) -> dict:
     """Load YAML config file. Returns {} if not found or parse error."""
-    if not os.path.exists(path):
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
         return {}
+    cached = _YAML_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, _parse_yaml(path))
+        _YAML_CACHE[path] = cached
+    # Callers merge and mutate the result: never hand out the cached dict
+    return copy.deepcopy(cached[1])
+
+
+def _parse_yaml(path: str) -> dict:
     try:
         import yaml
         with open(path, "r", encoding="utf-8") as f:
@@ -129,8 +145,7 @@ def load_config(yaml_path: str = None) -> dict:
     Environment Variables > worker_config.yaml > Code Defaults
     """
     # 1. Start with defaults
-    cfg = _DEFAULTS.copy()
-    cfg["models"] = {k: v.copy() for k, v in _DEFAULTS["models"].items()}
+    cfg = copy.deepcopy(_DEFAULTS)
 
     # 2. Merge YAML (if available)
     if yaml_path is None:
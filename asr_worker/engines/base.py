@@ -1,19 +1,47 @@
 import os
-import datetime
 from abc import ABC, abstractmethod
 
 # Helper: Format seconds to SRT timestamp
 def format_timestamp(seconds: float) -> str:
-    td = datetime.timedelta(seconds=seconds)
-    # timedelta string is like "0:00:12.345000" or "1 day, 0:00:12.345000"
-    # We need HH:MM:SS,mmm
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    millis = int(td.microseconds / 1000)
+    # HH:MM:SS,mmm in plain integer math: round to whole microseconds, then
+    # truncate to milliseconds (same result as the former timedelta version)
+    ms = round(seconds * 1_000_000) // 1000
+    hours, rem = divmod(ms, 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    secs, millis = divmod(rem, 1000)
     return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
 
+_PCM_READ_CHUNK = 1 << 20  # 1 MiB
+
+
+def _read_process_stdout(cmd: list, startupinfo=None) -> memoryview:
+    """
+    Run cmd and collect its whole stdout in a BytesIO (grows in place, no
+    joined bytes copy); returns a zero-copy view of it. stderr is drained on
+    a side thread so a chatty process can never block on a full pipe.
+    Raises RuntimeError on non-zero exit.
+    """
+    import io
+    import shutil
+    import subprocess
+    import threading
+
+    bio = io.BytesIO()
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=startupinfo) as p:
+        err = []
+        drain = threading.Thread(target=lambda: err.append(p.stderr.read()), daemon=True)
+        drain.start()
+        try:
+            shutil.copyfileobj(p.stdout, bio, _PCM_READ_CHUNK)
+        except BaseException:
+            p.kill()
+            raise
+        drain.join()
+        if p.wait() != 0:
+            stderr = err[0] if err else b""
+            raise RuntimeError(f"Failed to load audio: {stderr.decode(errors='ignore')}")
+    return bio.getbuffer()
+
 # Base Class for ASR Engines
 class ASREngine(ABC):
     @abstractmethod
@@ -54,14 +82,11 @@ class ASREngine(ABC):
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
             startupinfo.wShowWindow = subprocess.SW_HIDE
             
-        try:
-            out = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                startupinfo=startupinfo,
-                check=True
-            ).stdout
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='ignore')}") from e
+        out = _read_process_stdout(cmd, startupinfo)
 
-        return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+        # Convert and scale in one ufunc pass into a single float32 buffer
+        # (1/32768 is a power of two, so this matches dividing exactly)
+        pcm = np.frombuffer(out, np.int16, count=len(out) // 2)
+        audio = np.empty(pcm.shape, dtype=np.float32)
+        np.multiply(pcm, np.float32(1.0 / 32768.0), out=audio)
+        return audio
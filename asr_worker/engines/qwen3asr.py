@@ -21,6 +21,9 @@ LANG_MAP = {
     "it": "Italian",
 }
 
+# Sentence-ending punctuation that closes an SRT segment
+_SENT_END = frozenset("。.！!？?；;")
+
 
 class Qwen3ASREngine(ASREngine):
     def __init__(self):
@@ -138,13 +141,13 @@ class Qwen3ASREngine(ASREngine):
             if check_cancel_func:
                 check_cancel_func()
 
-            srt_content = ""
+            srt_parts = []
             seg_index = 1
 
             for r in results:
                 if not r.time_stamps:
                     # Fallback: no timestamps available, output as single block
-                    srt_content += f"{seg_index}\n00:00:00,000 --> 00:00:00,000\n{r.text}\n\n"
+                    srt_parts.append(f"{seg_index}\n00:00:00,000 --> 00:00:00,000\n{r.text}\n\n")
                     seg_index += 1
                     continue
 
@@ -164,13 +167,17 @@ class Qwen3ASREngine(ASREngine):
                     current_text += ts.text
 
                     # Segment on sentence-ending punctuation or every ~15s
-                    is_sentence_end = ts.text.rstrip().endswith(("。", ".", "！", "!", "？", "?", "；", ";"))
+                    # Only strip when the token actually ends in whitespace
+                    last = ts.text[-1:]
+                    if last.isspace():
+                        last = ts.text.rstrip()[-1:]
+                    is_sentence_end = last in _SENT_END
                     is_long_segment = (seg_end - seg_start) > 15.0
 
                     if is_sentence_end or is_long_segment:
                         start_str = format_timestamp(seg_start)
                         end_str = format_timestamp(seg_end)
-                        srt_content += f"{seg_index}\n{start_str} --> {end_str}\n{current_text.strip()}\n\n"
+                        srt_parts.append(f"{seg_index}\n{start_str} --> {end_str}\n{current_text.strip()}\n\n")
                         seg_index += 1
                         current_text = ""
                         seg_start = None
@@ -180,11 +187,11 @@ class Qwen3ASREngine(ASREngine):
                 if current_text.strip() and seg_start is not None:
                     start_str = format_timestamp(seg_start)
                     end_str = format_timestamp(seg_end)
-                    srt_content += f"{seg_index}\n{start_str} --> {end_str}\n{current_text.strip()}\n\n"
+                    srt_parts.append(f"{seg_index}\n{start_str} --> {end_str}\n{current_text.strip()}\n\n")
                     seg_index += 1
 
             self._cleanup_vram()
-            return srt_content
+            return "".join(srt_parts)
         else:
             # No aligner: output entire text as single SRT entry
             results = self.model.transcribe(
@@ -225,13 +232,13 @@ class Qwen3ASREngine(ASREngine):
         if check_cancel_func:
             check_cancel_func()
 
-        srt_content = ""
+        srt_parts = []
         seg_index = 1
 
         for r in results:
             if not r.time_stamps:
                 # Fallback: no timestamps, output as single block
-                srt_content += f"{seg_index}\n00:00:00,000 --> 00:00:00,000\n{r.text}\n\n"
+                srt_parts.append(f"{seg_index}\n00:00:00,000 --> 00:00:00,000\n{r.text}\n\n")
                 seg_index += 1
                 continue
 
@@ -245,11 +252,11 @@ class Qwen3ASREngine(ASREngine):
 
                 start_str = format_timestamp(ts.start_time)
                 end_str = format_timestamp(ts.end_time)
-                srt_content += f"{seg_index}\n{start_str} --> {end_str}\n{text}\n\n"
+                srt_parts.append(f"{seg_index}\n{start_str} --> {end_str}\n{text}\n\n")
                 seg_index += 1
 
         self._cleanup_vram()
-        return srt_content
+        return "".join(srt_parts)
 
     def _cleanup_vram(self):
         """Release temporary VRAM after inference to prevent accumulation."""
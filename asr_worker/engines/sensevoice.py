@@ -5,6 +5,10 @@ from .base import ASREngine, format_timestamp
 
 logger = logging.getLogger("ASR Worker")
 
+_SV_TAG_RE = re.compile(r'<\|(BGM|Speech|Applause|Laughter|Cry|Music|Bird|Bell)\|>', re.IGNORECASE)
+_EMOJI_RE = re.compile(r'[\U00010000-\U0010ffff]')
+_BRACKET_RE = re.compile(r'\[.*?\]')
+
 class SenseVoiceEngine(ASREngine):
     def __init__(self):
         from config import get_config, get_engine_config
@@ -34,13 +38,13 @@ class SenseVoiceEngine(ASREngine):
 
     def clean_text(self, text: str) -> str:
         # 1. Keep SenseVoice tags (<|HAPPY|>, <|zh|>, etc.) but remove sound events
-        text = re.sub(r'<\|(BGM|Speech|Applause|Laughter|Cry|Music|Bird|Bell)\|>', '', text, flags=re.IGNORECASE)
+        text = _SV_TAG_RE.sub('', text)
         
         # 2. Remove emojis
-        text = re.sub(r'[\U00010000-\U0010ffff]', '', text) 
+        text = _EMOJI_RE.sub('', text)
         
         # 3. Remove square brackets
-        text = re.sub(r'\[.*?\]', '', text)
+        text = _BRACKET_RE.sub('', text)
         
         return text.strip()
 
@@ -88,7 +92,7 @@ class SenseVoiceEngine(ASREngine):
             merge_length_s=15,
         )
         
-        srt_content = ""
+        srt_parts = []
         for i, item in enumerate(res):
             if check_cancel_func: check_cancel_func()
             text = self.clean_text(item.get('text', ''))
@@ -100,6 +104,6 @@ class SenseVoiceEngine(ASREngine):
             start_str = format_timestamp(start_ms / 1000.0)
             end_str = format_timestamp(end_ms / 1000.0)
             
-            srt_content += f"{i+1}\n{start_str} --> {end_str}\n{text}\n\n"
+            srt_parts.append(f"{i+1}\n{start_str} --> {end_str}\n{text}\n\n")
             
-        return srt_content
+        return "".join(srt_parts)
@@ -77,7 +77,7 @@ class WhisperEngine(ASREngine):
             beam_size=5
         )
         
-        srt_content = ""
+        srt_parts = []
         segments = result.get('segments', [])
         
         for i, seg in enumerate(segments):
@@ -91,6 +91,6 @@ class WhisperEngine(ASREngine):
                 text = re.sub(r'(?<=[\u4e00-\u9fff])\.', '。', text)
                 text = re.sub(r'\.(?=\s|$)', '。', text)
                 
-            srt_content += f"{i+1}\n{start} --> {end}\n{text}\n\n"
+            srt_parts.append(f"{i+1}\n{start} --> {end}\n{text}\n\n")
             
-        return srt_content
+        return "".join(srt_parts)